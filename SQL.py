@@ -1,13 +1,14 @@
 import os
-import jpype
-import jaydebeapi
+
+from db import configure, default_url, shutdown, transaction
+from schema import SCHEMA_VERSION, VERSION_SQL
 
 # 현재 실행 디렉터리 설정
 base_dir = os.path.dirname(os.path.abspath(__file__))
 h2_jar_path = os.path.join(base_dir, "jar/h2-2.3.232.jar")
 
 # H2 데이터베이스 연결 정보
-db_url = "jdbc:h2:tcp://localhost/~/test"
+db_url = default_url()  # H2_DB_URL 환경 변수로 변경 (tcp, file, mem 또는 JDBC URL)
 username = "sa"
 password = ""
 
@@ -18,24 +19,25 @@ CREATE TABLE member_table (
     id VARCHAR(50) NOT NULL UNIQUE,
     password VARCHAR(100) NOT NULL,
     name VARCHAR(100) NOT NULL,
-    dob VARCHAR(10),
+    dob DATE,
     gender VARCHAR(10) CHECK(gender IN ('남', '여')),
     address VARCHAR(255),
     email VARCHAR(100),
     phone VARCHAR(20),
     admin VARCHAR(10) CHECK (admin IN ('Y', 'N')),
-    joinDate VARCHAR(10),
-    delete VARCHAR(10) CHECK (delete IN ('True', 'False'))
+    joinDate DATE,
+    delete BOOLEAN
 );
 
 CREATE TABLE category_table (
     category_no INTEGER PRIMARY KEY AUTO_INCREMENT,
     name VARCHAR(100) NOT NULL,
-    delete VARCHAR(10) CHECK (delete IN ('True', 'False'))
+    delete BOOLEAN
 );
 
 CREATE TABLE product_table (
     product_no INTEGER PRIMARY KEY AUTO_INCREMENT,
+    code VARCHAR(10) UNIQUE,
     category_no INTEGER,
     name VARCHAR(100) NOT NULL,
     company VARCHAR(100),
@@ -44,18 +46,19 @@ CREATE TABLE product_table (
     sell_count INTEGER DEFAULT 0,
     quantity INTEGER,
     visit INTEGER DEFAULT 0,
-    seal_service VARCHAR(10) CHECK (seal_service IN ('True', 'False')),
-    delete VARCHAR(10) CHECK (delete IN ('True', 'False')),
+    seal_service BOOLEAN,
+    delete BOOLEAN,
     FOREIGN KEY (category_no) REFERENCES category_table(category_no)
 );
 
 CREATE TABLE buy_table (
     buy_no INTEGER PRIMARY KEY AUTO_INCREMENT,
+    purchase_key VARCHAR(30) UNIQUE,
     member_no INTEGER,
     product_no INTEGER,
-    date VARCHAR(10),
+    date DATE,
     quantity INTEGER,
-    seal_service VARCHAR(10),
+    seal_service BOOLEAN,
     total_price INTEGER,
     method VARCHAR(50),
     FOREIGN KEY (member_no) REFERENCES member_table(member_no),
@@ -65,11 +68,11 @@ CREATE TABLE buy_table (
 CREATE TABLE image_table (
     image_no INTEGER PRIMARY KEY AUTO_INCREMENT,
     product_no INTEGER,
-    origin_path VARCHAR(255),
+    origin_path VARCHAR(255) UNIQUE,
     save_path VARCHAR(255),
-    save_date VARCHAR(10),
-    update_date VARCHAR(10),
-    delete VARCHAR(10) CHECK (delete IN ('True', 'False')),
+    save_date DATE,
+    update_date DATE,
+    delete BOOLEAN,
     FOREIGN KEY (product_no) REFERENCES product_table(product_no)
 );
 
@@ -80,35 +83,26 @@ INSERT INTO category_table (category_no, name, delete) VALUES
     (4, '필기류', 'False');
 """
 
+# H2 연결 설정 (블록이 끝나면 커밋, 오류가 나면 롤백)
+configure(h2_jar_path, db_url, username, password)
 try:
-    # H2 연결 설정
-    conn = jaydebeapi.connect(
-        "org.h2.Driver",
-        db_url,
-        [username, password],
-        h2_jar_path
-    )
-    cursor = conn.cursor()
-    print("H2 데이터베이스 연결 성공!")
-
-    # 기존 데이터베이스 초기화
-    cursor.execute("DROP ALL OBJECTS")
-    print("기존 데이터베이스 초기화 완료!")
+    with transaction() as cursor:
+        print("H2 데이터베이스 연결 성공!")
 
-    # 테이블 생성 및 데이터 삽입
-    for statement in create_sql.strip().split(";"):
-        if statement.strip():
-            cursor.execute(statement)
-    print("테이블 생성 및 데이터 삽입 완료!")
+        # 기존 데이터베이스 초기화
+        cursor.execute("DROP ALL OBJECTS")
+        print("기존 데이터베이스 초기화 완료!")
 
-    # 커밋 및 연결 닫기
-    conn.commit()
-    cursor.close()
-    conn.close()
+        # 테이블 생성 및 데이터 삽입
+        for statement in create_sql.strip().split(";"):
+            if statement.strip():
+                cursor.execute(statement)
+        cursor.execute(VERSION_SQL)
+        cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (SCHEMA_VERSION,))
+        print("테이블 생성 및 데이터 삽입 완료!")
 
 except Exception as e:
     print(f"오류 발생: {e}")
 
 finally:
-    if jpype.isJVMStarted():
-        jpype.shutdownJVM()
+    shutdown()
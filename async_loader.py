@@ -0,0 +1,117 @@
+import asyncio
+import inspect
+import threading
+import contextlib
+from concurrent.futures import Future
+
+import main
+import metrics
+import cancellation
+from db import detach_thread
+from cancellation import LoadCancelled
+
+# 서비스/스케줄러에서 다른 작업과 함께 돌리는 asyncio 적재 API
+#     result = await load_all({"workers": 4})
+#     async for event in load_events(config): ...
+# - 적재 전체 (main.run_load) 는 적재마다 만드는 전용 DB 스레드에서 실행되어 이벤트 루프를 막지 않는다
+#   CSV 파싱은 workers > 1 이면 프로세스 풀에서, JDBC 쓰기는 항상 이 DB 스레드에서만 한다
+# - 진행 이벤트는 metrics 기록과 같은 dict 로 이벤트 루프 스레드에서 받는다
+#   stage (단계 완료), file (파일 완료), chunk (--chunksize 청크 완료), batch (executeBatch 완료), run (실행 요약)
+# - 적재를 기다리는 태스크를 취소하면 DB 스레드가 다음 확인 지점에서 멈추고 마지막 커밋 이후 변경을 롤백한 뒤
+#   CancelledError 가 전달된다 (파일 단위로 커밋된 부분은 다음 실행에서 이어서 적재)
+# - JVM 은 프로세스에서 한 번만 띄울 수 있으므로 적재가 끝나도 연결과 JVM 은 닫지 않는다 (서비스 종료 시 db.shutdown())
+# 적재 상태 (affected_products 등) 가 모듈 전역이므로 한 번에 하나의 적재만 실행할 수 있다
+
+_running = threading.Lock()
+
+
+def load_options(config=None):
+    # config -> main.parse_args 와 같은 옵션 객체
+    # None 이면 명령행 기본값, dict 면 기본값에 덮어쓸 옵션 ({"full": True, "batch_size": 5000, ...}),
+    # 그 밖에는 parse_args 결과로 보고 그대로 쓴다
+    if config is not None and not isinstance(config, dict):
+        return config
+    options = main.parse_args([])
+    for key, value in (config or {}).items():
+        key = key.replace("-", "_")
+        if not hasattr(options, key):
+            raise ValueError(f"알 수 없는 적재 옵션: {key}")
+        setattr(options, key, value)
+    return options
+
+
+def start_loader(options):
+    # 전용 DB 스레드에서 main.run_load(options) 를 실행하고 결과를 담을 Future 를 반환
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(main.run_load(options))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            detach_thread()
+
+    threading.Thread(target=run, name="h2-loader", daemon=True).start()
+    return future
+
+
+async def load_events(config=None):
+    # 적재를 시작하고 진행 이벤트를 차례로 내보내는 비동기 제너레이터
+    # 적재가 실패하면 마지막 이벤트 뒤에 그 예외가 발생한다
+    # 태스크가 취소되거나 중간에 반복을 멈추면 적재를 취소하고 롤백이 끝날 때까지 기다린다
+    # (async for 를 break 로 빠져나올 때는 contextlib.aclosing 으로 감싸야 바로 정리된다)
+    options = load_options(config)
+    if not _running.acquire(blocking=False):
+        raise RuntimeError("이미 적재가 진행 중입니다")
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def listener(record):
+        # DB 스레드에서 호출되므로 이벤트 루프 스레드로 넘긴다
+        loop.call_soon_threadsafe(events.put_nowait, record)
+
+    cancellation.clear()
+    metrics.listeners.append(listener)
+    future = None
+    try:
+        future = asyncio.wrap_future(start_loader(options))
+        # 적재가 끝나면 (그 전에 넘긴 이벤트를 모두 꺼낸 뒤) 반복을 마친다
+        future.add_done_callback(lambda _: events.put_nowait(None))
+        while True:
+            record = await events.get()
+            if record is None:
+                break
+            yield record
+        await future
+    finally:
+        if future is not None and not future.done():
+            cancellation.request()
+            # DB 스레드가 롤백을 마칠 때까지 기다린다 (그 전에 다음 적재를 시작하지 않도록)
+            await asyncio.wait([future])
+            if not future.cancelled() and isinstance(future.exception(), LoadCancelled):
+                print("적재가 취소되어 마지막 커밋 이후의 변경을 롤백했습니다")
+        metrics.listeners.remove(listener)
+        _running.release()
+
+
+async def load_all(config=None, on_progress=None):
+    # 적재 전체를 실행하고 실행 요약 ("run" 기록) 을 반환
+    # on_progress(event) 는 이벤트 루프 스레드에서 호출된다 (코루틴 함수면 await 한다)
+    result = None
+    async with contextlib.aclosing(load_events(config)) as events:
+        async for record in events:
+            if record["event"] == "run":
+                result = record
+            if on_progress is not None:
+                called = on_progress(record)
+                if inspect.isawaitable(called):
+                    await called
+    return result
+
+
+def cancel():
+    # 다른 스레드에서 실행 중인 적재 취소 요청 (asyncio 에서는 load_all 을 기다리는 태스크를 취소하면 된다)
+    cancellation.request()
@@ -0,0 +1,256 @@
+import io
+import os
+import json
+import time
+import tempfile
+import tracemalloc
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+
+import main
+import metrics
+from columnar import read_table
+from column_spec import CLEANERS
+from csv_cache import CACHE_ENABLED_ENV
+from db import DB_TARGETS, close_all, configure, shutdown, transaction
+from synthetic_data import generate
+
+# 비교할 적재 방식: (이름, batch_size, server_side)
+# "row" 는 executeBatch 를 한 행씩 보내 기존 iterrows 방식과 같은 왕복 횟수를 재현한다
+LOAD_MODES = [
+    ("row", 1, False),
+    ("batch", main.BATCH_SIZE, False),
+    ("server", main.BATCH_SIZE, True),
+]
+
+# 비교할 접속 대상: (이름, JDBC URL)
+# file 모드는 TCP 서버가 열어 둔 DB 파일과 겹치지 않도록 임시 폴더의 별도 파일을 쓴다
+DB_MODES = [
+    ("tcp", DB_TARGETS["tcp"]),
+    ("file", "jdbc:h2:file:" + os.path.join(tempfile.gettempdir(), "h2_benchmark")),
+    ("mem", "jdbc:h2:mem:benchmark;DB_CLOSE_DELAY=-1"),
+]
+
+# 열 타입별 정리 속도 측정에 쓸 원본 값: (열 타입, CSV 파일, 헤더)
+COLUMN_SAMPLES = [
+    ("text", "회원목록_2023년.csv", "성함"),
+    ("count", "구매이력_2023년.csv", "구매_수량"),
+    ("amount", "구매이력_2023년.csv", "총_결제_금액"),
+    ("flag", "구매이력_2023년.csv", "각인_서비스"),
+    ("date", "구매이력_2023년.csv", "구매_날짜"),
+    ("category", "상품목록.csv", "category_no"),
+    ("resident_no", "회원목록_2023년.csv", "주민번호"),
+]
+
+
+# 규모별 측정에서 JDBC 호출로 세는 세부 구간 (metrics.timer 이름)
+JDBC_CALLS = ["jdbc_batch", "jdbc_row", "h2_csvread", "commit"]
+
+
+def count_rows(cursor, table):
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    return int(str(cursor.fetchone()[0]))
+
+
+def time_load(cursor, name, batch_size, server_side, repeat):
+    # 회원/구매 데이터를 repeat 번 다시 적재하고 (이름, 행 수, 최소 시간, rows/s) 를 반환
+    timings = []
+    for _ in range(repeat):
+        # 로더의 진행 메시지는 결과 표를 가리지 않도록 숨긴다
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.initialize_database(cursor)
+            main.load_products(cursor)
+            start = time.perf_counter()
+            main.load_members(cursor, batch_size, server_side)
+            main.load_purchases(cursor, batch_size, server_side)
+            timings.append(time.perf_counter() - start)
+    rows = count_rows(cursor, "member_table") + count_rows(cursor, "buy_table")
+    best = min(timings)
+    return name, rows, best, rows / best if best else 0
+
+
+def bench_load_modes(cursor, repeat):
+    # 각 방식으로 회원/구매 데이터를 다시 적재하며 소요 시간을 측정
+    return [time_load(cursor, name, batch_size, server_side, repeat)
+            for name, batch_size, server_side in LOAD_MODES]
+
+
+def bench_db_modes(repeat):
+    # 접속 대상마다 새 연결로 같은 배치 적재를 실행해 소요 시간을 비교
+    results = []
+    for name, url in DB_MODES:
+        close_all()
+        configure(main.h2_jar_path, url, main.username, main.password)
+        try:
+            with transaction() as cursor:
+                results.append(time_load(cursor, name, main.BATCH_SIZE, False, repeat))
+        except Exception as e:
+            print(f"{name} 모드 측정 실패: {e}")
+    return results
+
+
+def bench_column_types(rows, repeat):
+    # 실제 CSV 값을 rows 행으로 늘려 열 타입마다 정리 함수(CLEANERS) 한 번의 소요 시간을 측정 (DB 사용 안 함)
+    results = []
+    for column_type, file_name, header in COLUMN_SAMPLES:
+        df = pd.read_csv(os.path.join(main.csv_folder, file_name), encoding="utf-8")
+        df.columns = df.columns.str.strip()
+        series = pd.Series(np.resize(df[header].to_numpy(), rows), dtype=df[header].dtype)
+        cleaner = CLEANERS[column_type]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cleaner(series)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results.append((column_type, rows, best, rows / best if best else 0))
+    return results
+
+
+def time_loader(name, load):
+    # 로더 하나를 실행하고 (이름, 읽은 행 수, 시간, 최대 메모리(byte), JDBC 호출 수) 를 반환
+    calls_before = sum(metrics.calls.get(key, 0) for key in JDBC_CALLS)
+    rows_before = metrics.rows_read()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        load()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    calls = sum(metrics.calls.get(key, 0) for key in JDBC_CALLS) - calls_before
+    return name, metrics.rows_read() - rows_before, seconds, peak, calls
+
+
+def bench_scale(data_dir, repeat, batch_size=main.BATCH_SIZE, server_side=False):
+    # data_dir 의 CSV 를 메모리 DB 에 repeat 번 적재하며 로더별 rows/s, 최대 메모리, JDBC 호출 수를 측정
+    # (Arrow 캐시는 쓰지 않고 매번 CSV 를 읽는다, tracemalloc 으로 메모리를 재므로 시간은 그만큼 느려진다)
+    os.environ[CACHE_ENABLED_ENV] = "0"
+    product_file = os.path.join(data_dir, "상품목록.csv")
+    member_files = sorted(os.path.join(data_dir, name) for name in os.listdir(data_dir) if name.startswith("회원목록_"))
+    purchase_files = sorted(os.path.join(data_dir, name) for name in os.listdir(data_dir)
+                            if name.startswith("구매이력_"))
+
+    close_all()
+    configure(main.h2_jar_path, dict(DB_MODES)["mem"], main.username, main.password)
+    runs = []
+    tracemalloc.start()
+    try:
+        with transaction() as cursor:
+            for _ in range(repeat):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    main.initialize_database(cursor)
+                runs.append([
+                    time_loader("products", lambda: main.load_products(cursor, batch_size, product_file)),
+                    time_loader("members", lambda: main.load_members(cursor, batch_size, server_side,
+                                                                     member_files)),
+                    time_loader("purchases", lambda: main.load_purchases(cursor, batch_size, server_side,
+                                                                         purchase_files)),
+                ])
+    finally:
+        tracemalloc.stop()
+    # 로더별로 가장 빠른 회차를 기록
+    return [min(results, key=lambda result: result[2]) for results in zip(*runs)]
+
+
+def print_scale_results(results):
+    print(f"{'로더':<12}{'행 수':>12}{'최소 시간(s)':>14}{'rows/s':>12}{'최대 메모리(MB)':>16}{'JDBC 호출':>12}")
+    for name, rows, seconds, peak, calls in results:
+        rate = rows / seconds if seconds else 0
+        print(f"{name:<12}{rows:>12}{seconds:>14.3f}{rate:>12.0f}{peak / 2 ** 20:>16.1f}{calls:>12}")
+
+
+def save_scale_results(path, label, settings, results):
+    # 버전 간 비교용으로 결과를 JSON Lines 로 덧붙인다
+    with open(path, "a", encoding="utf-8") as f:
+        for name, rows, seconds, peak, calls in results:
+            f.write(json.dumps({"label": label, **settings, "loader": name, "rows": rows,
+                                "seconds": round(seconds, 4), "rows_per_s": round(rows / seconds, 1) if seconds else 0,
+                                "peak_bytes": peak, "jdbc_calls": calls}, ensure_ascii=False) + "\n")
+
+
+def fetchall_frame(cursor, table):
+    # jaydebeapi fetchall 로 행 튜플을 받아 DataFrame 을 만드는 기존 방식
+    cursor.execute(f"SELECT * FROM {table}")
+    columns = [str(description[0]).lower() for description in cursor.description]
+    return pd.DataFrame([[None if value is None else str(value) for value in row] for row in cursor.fetchall()],
+                        columns=columns)
+
+
+def bench_read(cursor, repeat, table="buy_table"):
+    # 적재된 table 전체를 방식마다 DataFrame 으로 읽는 시간 비교
+    read_modes = [
+        ("fetchall", lambda: fetchall_frame(cursor, table)),
+        ("jdbc", lambda: read_table(cursor, table, method="jdbc")),
+        ("csv", lambda: read_table(cursor, table, method="csv")),
+    ]
+    results = []
+    for name, read in read_modes:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = len(read())
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results.append((name, rows, best, rows / best if best else 0))
+    return results
+
+
+def print_results(results):
+    print(f"{'방식':<12}{'행 수':>10}{'최소 시간(s)':>14}{'rows/s':>12}")
+    for name, rows, seconds, rate in results:
+        print(f"{name:<12}{rows:>10}{seconds:>14.3f}{rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="회원/구매 데이터 적재 방식/접속 대상별 성능 비교")
+    parser.add_argument("--repeat", type=int, default=3, help="방식별 반복 횟수 (최소값을 기록)")
+    parser.add_argument("--compare", choices=["load", "db", "columns", "scale", "read"], default="load",
+                        help="load: 적재 방식(row/batch/server) 비교, db: 접속 대상(tcp/file/mem) 비교, "
+                             "columns: 열 타입별 정리 속도, scale: 가상 데이터로 로더별 처리량 측정 (메모리 DB), "
+                             "read: 적재된 buy_table 을 읽는 방식(fetchall/jdbc/csv) 비교")
+    parser.add_argument("--rows", type=int, default=100000, help="columns 비교에 사용할 행 수")
+    parser.add_argument("--data", default=None,
+                        help="scale 측정에 사용할 CSV 폴더 (없으면 --members/--purchases/--seed 로 임시 폴더에 생성)")
+    parser.add_argument("--members", type=int, default=10000, help="scale: 생성할 전체 회원 수")
+    parser.add_argument("--purchases", type=int, default=20000, help="scale: 생성할 연도별 구매 이력 행 수")
+    parser.add_argument("--seed", type=int, default=0, help="scale: 가상 데이터 난수 seed")
+    parser.add_argument("--batch-size", type=int, default=main.BATCH_SIZE, help="scale: executeBatch 행 수")
+    parser.add_argument("--server-load", action="store_true", help="scale: CSVREAD 서버 적재로 측정")
+    parser.add_argument("--output", default=None, help="scale: 결과를 JSON Lines 로 덧붙일 파일")
+    parser.add_argument("--label", default="", help="scale: 결과에 함께 기록할 이름 (버전, 브랜치 등)")
+    args = parser.parse_args()
+
+    if args.compare == "columns":
+        # DB 없이 정리 함수만 측정
+        print_results(bench_column_types(args.rows, args.repeat))
+    elif args.compare == "scale":
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data_dir = args.data
+            if data_dir is None:
+                data_dir = temp_dir
+                print(f"가상 데이터 생성 중: 회원 {args.members}명, 연도별 구매 {args.purchases}건")
+                generate(data_dir, args.members, args.purchases, seed=args.seed)
+            try:
+                results = bench_scale(data_dir, args.repeat, args.batch_size, args.server_load)
+            finally:
+                shutdown()
+        print_scale_results(results)
+        if args.output:
+            settings = {"members": args.members, "purchases": args.purchases, "seed": args.seed,
+                        "data": args.data, "batch_size": args.batch_size, "server_load": args.server_load}
+            save_scale_results(args.output, args.label, settings, results)
+    else:
+        configure(main.h2_jar_path, main.db_url, main.username, main.password)
+        try:
+            if args.compare == "db":
+                print_results(bench_db_modes(args.repeat))
+            elif args.compare == "read":
+                with transaction() as cursor:
+                    print_results(bench_read(cursor, args.repeat))
+            else:
+                with transaction() as cursor:
+                    print_results(bench_load_modes(cursor, args.repeat))
+        finally:
+            shutdown()
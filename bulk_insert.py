@@ -0,0 +1,135 @@
+import os
+import tempfile
+
+from cancellation import checkpoint
+from db import commit, release_savepoint, rollback_to_savepoint, set_savepoint
+from metrics import notify, timer
+
+# 한 번의 executeBatch 로 보낼 기본 행 수
+BATCH_SIZE = 1000
+
+# 중간 커밋 간격 (행 수, 0 이면 호출한 쪽에서 커밋할 때까지 하나의 트랜잭션)
+COMMIT_EVERY = 10000
+
+# JDBC Statement.EXECUTE_FAILED 값
+EXECUTE_FAILED = -3
+
+
+def column_batches(df, columns):
+    # DataFrame 의 각 열을 DB 에 보낼 파이썬 기본 타입 리스트로 변환 (NaN -> None)
+    batches = []
+    for col in columns:
+        series = df[col]
+        batches.append(series.astype(object).where(series.notna(), None).tolist())
+    return batches
+
+
+def _failed_positions(exc, size):
+    # BatchUpdateException 의 update count 로 실패한 행 위치를 찾는다
+    # (update count 를 얻을 수 없으면 None 을 반환해 전체를 행 단위로 재시도하게 한다)
+    for source in (exc, exc.args[0] if exc.args else None):
+        get_counts = getattr(source, "getUpdateCounts", None)
+        if get_counts is None:
+            continue
+        counts = list(get_counts())
+        failed = [i for i, count in enumerate(counts) if count == EXECUTE_FAILED]
+        # 드라이버가 첫 오류에서 멈춘 경우 실행되지 않은 나머지 행도 재시도 대상
+        failed.extend(range(len(counts), size))
+        return failed
+    return None
+
+
+def execute_dataframe(cursor, sql, columns, df, batch_size=BATCH_SIZE, commit_every=None):
+    # DataFrame 을 batch_size 단위로 나누어 executemany(addBatch/executeBatch)로 실행
+    # 배치마다 세이브포인트를 잡고, 실패한 행만 각자의 세이브포인트 안에서 한 건씩 재시도해
+    # 잘못된 행 하나가 배치 전체를 되돌리지 않게 한다
+    # commit_every 행마다 커밋 (None 이면 COMMIT_EVERY, 0 이면 중간 커밋 없음)
+    # 배치마다 취소 요청을 확인하고 진행 이벤트 ("batch") 를 알린다
+    # 반환값: (성공한 행 수, [(행 인덱스, 오류 메시지), ...])
+    if commit_every is None:
+        commit_every = COMMIT_EVERY
+    # marshal: DataFrame -> 파이썬 값, jdbc_batch: JPype 변환 + executeBatch, jdbc_row: 실패 행 재시도
+    with timer("marshal"):
+        rows = list(zip(*column_batches(df, columns)))
+    index = list(df.index)
+    succeeded = 0
+    uncommitted = 0
+    errors = []
+
+    for start in range(0, len(rows), batch_size):
+        checkpoint()
+        chunk = rows[start:start + batch_size]
+        batch_savepoint = set_savepoint(cursor)
+        try:
+            with timer("jdbc_batch"):
+                cursor.executemany(sql, chunk)
+            failed = []
+        except Exception as e:
+            failed = _failed_positions(e, len(chunk))
+            if failed is None:
+                # 어느 행이 반영됐는지 알 수 없으면 배치를 되돌리고 모든 행을 한 건씩 재시도
+                rollback_to_savepoint(cursor, batch_savepoint)
+                failed = range(len(chunk))
+        succeeded += len(chunk) - len(failed)
+
+        # 실패한 행만 한 건씩 다시 실행해 행별 오류 원인을 남긴다
+        for pos in failed:
+            row_savepoint = set_savepoint(cursor)
+            try:
+                with timer("jdbc_row"):
+                    cursor.execute(sql, chunk[pos])
+                succeeded += 1
+            except Exception as e:
+                rollback_to_savepoint(cursor, row_savepoint)
+                errors.append((index[start + pos], str(e)))
+        release_savepoint(cursor, batch_savepoint)
+
+        uncommitted += len(chunk)
+        if commit_every and uncommitted >= commit_every:
+            commit(cursor)
+            uncommitted = 0
+        notify("batch", rows=start + len(chunk), total=len(rows), succeeded=succeeded, failed=len(errors))
+
+    return succeeded, errors
+
+
+def insert_dataframe(cursor, table, columns, df, batch_size=BATCH_SIZE, commit_every=None):
+    # DataFrame 의 행을 INSERT 배치로 삽입
+    insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    return execute_dataframe(cursor, insert_sql, columns, df, batch_size, commit_every)
+
+
+def merge_dataframe(cursor, table, columns, key, df, batch_size=BATCH_SIZE, commit_every=None):
+    # H2 MERGE INTO ... KEY 배치로 key 가 같은 행은 갱신, 없으면 삽입
+    # (columns 에 없는 열은 기존 값이 유지된다)
+    merge_sql = (f"MERGE INTO {table} ({', '.join(columns)}) KEY ({key}) "
+                 f"VALUES ({', '.join('?' for _ in columns)})")
+    return execute_dataframe(cursor, merge_sql, columns, df, batch_size, commit_every)
+
+
+def insert_via_csvread(cursor, table, columns, df, key=None):
+    # 정리된 DataFrame 을 임시 CSV 로 저장한 뒤 H2 가 CSVREAD 로 직접 읽어 한 번에 삽입
+    # key 가 있으면 MERGE INTO ... KEY 로 key 가 같은 행은 갱신
+    # (H2 서버가 같은 파일 시스템을 볼 수 있어야 한다: localhost TCP 또는 embedded 모드)
+    # 반환값: 삽입 (또는 갱신) 된 행 수
+    fd, csv_path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        # 헤더 없이 저장하고 CSVREAD 에 열 이름을 직접 넘긴다 (빈 값은 NULL 로 읽힘)
+        with timer("pandas_to_csv"):
+            df[columns].to_csv(csv_path, index=False, header=False, encoding="utf-8")
+        csv_columns = [f"C{i}" for i in range(len(columns))]
+        quoted_path = csv_path.replace("'", "''")
+        if key:
+            statement = f"MERGE INTO {table} ({', '.join(columns)}) KEY ({key})"
+        else:
+            statement = f"INSERT INTO {table} ({', '.join(columns)})"
+        with timer("h2_csvread"):
+            cursor.execute(
+                f"{statement} "
+                f"SELECT {', '.join(csv_columns)} "
+                f"FROM CSVREAD('{quoted_path}', '{','.join(csv_columns)}', 'charset=UTF-8')"
+            )
+        return cursor.rowcount
+    finally:
+        os.remove(csv_path)
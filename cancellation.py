@@ -0,0 +1,31 @@
+import threading
+
+# 실행 중인 적재의 협조적 취소
+# request() 로 취소를 요청하면 로더가 다음 확인 지점 (배치, 청크, 파일, 단계 경계) 의 checkpoint() 에서
+# LoadCancelled 를 발생시키고, transaction() 이 마지막 커밋 이후의 변경을 롤백한다
+# (이미 커밋하고 load_manifest 에 기록한 파일은 다음 실행에서 건너뛰고, 나머지 파일은 다시 적재한다)
+_requested = threading.Event()
+
+
+class LoadCancelled(BaseException):
+    # 로더의 "오류를 출력하고 다음 파일로" 처리 (except Exception) 에 걸리지 않도록 BaseException 을 상속한다
+    pass
+
+
+def request():
+    _requested.set()
+
+
+def clear():
+    # 새 적재를 시작하기 전에 호출
+    _requested.clear()
+
+
+def requested():
+    return _requested.is_set()
+
+
+def checkpoint():
+    # 취소가 요청되었으면 LoadCancelled 발생
+    if _requested.is_set():
+        raise LoadCancelled("적재가 취소되었습니다")
@@ -0,0 +1,184 @@
+from startup import lazy_import
+
+# 정리 함수를 처음 호출할 때 불러온다 (시작 시간 단축)
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# CSV 열 정의 (모든 로더가 같은 규칙으로 정리하도록 한 곳에 모아 둔다)
+# 각 항목: (대상 열 이름, 원본 헤더 별칭 목록, 열 타입)
+# - 헤더는 앞뒤 공백, 대소문자, 공백/밑줄 차이를 무시하고 비교한다 ('메일_주소' == '메일 주소')
+# - 열 타입마다 CLEANERS 의 벡터화된 변환 함수가 적용된다 (행 단위 apply/lambda 없음)
+# - 대상 열 이름이 튜플이면 변환 함수가 여러 열을 한 번에 만든다 (주민번호 -> 생년월일, 성별)
+
+# 카테고리 매핑 테이블 (문자열 -> 숫자 변환, 없는 값은 -1)
+CATEGORY_MAPPING = {
+    "art": 1,
+    "cases": 2,
+    "stationery": 3,
+    "writing": 4
+}
+
+# 참으로 읽는 표기 (나머지와 빈 값은 거짓)
+TRUE_VALUES = ["T", "TRUE", "Y", "YES", "1"]
+
+# 주민번호 뒷자리 첫 숫자 -> 성별, 출생 연도 앞 두 자리 (1/2: 1900년대, 3/4: 2000년대)
+GENDER_MAPPING = {"1": "남", "3": "남", "2": "여", "4": "여"}
+CENTURY_MAPPING = {"1": "19", "2": "19", "3": "20", "4": "20"}
+
+# 구매_ID 형식: 날짜-회원 번호-그날 순번 (연도에 따라 날짜와 회원 번호 사이 '-' 가 없다)
+# "2019-01-010069-1", "2023-01-01-0351-1"
+PURCHASE_ID_PATTERN = r"^(\d{4})-(\d{2})-(\d{2})-?(\d+)-(\d+)$"
+# 구매_ID -> 자연 키를 정규식 치환 한 번으로 만드는 형식 (회원 번호가 4자리 이상인 일반적인 경우)
+# 회원 번호 앞의 0 은 4자리가 남을 때까지, 순번 앞의 0 은 모두 뺀다 ("2019-01-010069-01" -> "2019-01-01-0069-1")
+PURCHASE_KEY_PATTERN = r"^\s*(\d{4}-\d{2}-\d{2})-?0*(\d{4,})-0*(\d+)\s*$"
+PURCHASE_KEY_FORMAT = r"\1-\2-\3"
+PURCHASE_KEY = r"\d{4}-\d{2}-\d{2}-\d{4,}-\d+"
+
+PRODUCT_SPEC = [
+    ("code", ["product_no"], "text"),
+    ("category_no", ["category_no"], "category"),
+    ("name", ["name"], "text"),
+    ("company", ["company"], "text"),
+    ("in_price", ["in_price"], "amount"),
+    ("out_price", ["out_price"], "amount"),
+    ("sell_count", ["sell_count"], "count"),
+    ("quantity", ["quantity"], "count"),
+    ("visit", ["visit"], "count"),
+    ("seal_service", ["seal_service"], "flag"),
+]
+
+MEMBER_SPEC = [
+    ("id", ["아이디"], "text"),
+    ("password", ["비밀번호"], "text"),
+    ("name", ["성함"], "text"),
+    (("dob", "gender"), ["주민번호"], "resident_no"),
+    ("address", ["주소"], "text"),
+    ("email", ["메일 주소"], "text"),
+    ("phone", ["전화번호"], "text"),
+    ("joinDate", ["회원_가입일"], "date"),
+]
+
+PURCHASE_SPEC = [
+    ("purchase_key", ["구매_ID"], "purchase_id"),
+    ("date", ["구매_날짜"], "date"),
+    ("member_no", ["구매자_ID"], "count"),
+    ("product_code", ["상품_ID"], "text"),
+    ("quantity", ["구매_수량"], "count"),
+    ("seal_service", ["각인_서비스"], "flag"),
+    ("method", ["결제_방식"], "text"),
+    ("total_price", ["총_결제_금액"], "amount"),
+]
+
+
+def header_key(name):
+    # 헤더 비교용 키 (앞뒤 공백, 대소문자, 공백/밑줄 차이 무시)
+    return str(name).strip().lower().replace(" ", "").replace("_", "")
+
+
+def clean_text(series):
+    # 앞뒤 공백 제거 (빈 문자열은 NULL)
+    text = series.astype("string").str.strip()
+    return text.astype(object).where(text.ne("").fillna(False).astype(bool), None)
+
+
+def clean_count(series):
+    # 정수 (숫자가 아니거나 빈 값은 0)
+    return pd.to_numeric(series, errors="coerce").fillna(0).astype(np.int64)
+
+
+def clean_amount(series):
+    # " 1,200,000 " 처럼 공백과 천 단위 쉼표가 들어간 금액 -> 정수 (빈 값은 0)
+    # (앞뒤 공백은 to_numeric 이 무시하므로 쉼표만 정규식 없이 지운다)
+    digits = series.astype("string").str.replace(",", "", regex=False)
+    return clean_count(digits)
+
+
+def clean_flag(series):
+    # T/F, True/False, Y/N 표기 -> bool (빈 값은 False)
+    return series.astype("string").str.strip().str.upper().isin(TRUE_VALUES).astype(bool)
+
+
+def clean_date(series):
+    # YYYY-MM-DD 날짜 문자열로 정리 (날짜가 아니면 NULL)
+    dates = pd.to_datetime(series.astype("string").str.strip(), format="%Y-%m-%d", errors="coerce")
+    return dates.dt.strftime("%Y-%m-%d").astype(object).where(dates.notna(), None)
+
+
+def clean_category(series):
+    # 카테고리 문자열 -> 카테고리 번호 (없는 값은 -1)
+    return series.astype("string").str.strip().str.lower().map(CATEGORY_MAPPING).fillna(-1).astype(np.int64)
+
+
+def clean_purchase_id(series):
+    # 구매_ID -> "YYYY-MM-DD-회원 번호(4자리 이상 0 채움)-순번" 형식의 자연 키 (형식이 다르면 NULL)
+    # 두 형식 모두 같은 키가 되고, 회원 번호/순번의 앞자리 0 차이도 없앤다 ("2019-01-010069-01" -> "2019-01-01-0069-1")
+    # 대부분의 행은 정규식 치환 한 번으로 키가 되고, 치환 결과가 키 형식이 아닌 행 (회원 번호가 4자리 미만이거나
+    # 형식 오류) 만 그룹을 나눠 숫자로 다시 만든다
+    key = series.astype("string").str.replace(PURCHASE_KEY_PATTERN, PURCHASE_KEY_FORMAT, regex=True)
+    done = key.str.fullmatch(PURCHASE_KEY).fillna(False).to_numpy(dtype=bool)
+    key = key.astype(object).where(done, None)
+    rest = ~done & series.notna().to_numpy()
+    if rest.any():
+        key[rest] = _padded_purchase_id(series[rest])
+    return key
+
+
+def _padded_purchase_id(series):
+    # 치환으로 만들지 못한 구매_ID 의 자연 키 (회원 번호를 4자리로 0 채움)
+    parts = series.astype("string").str.strip().str.extract(PURCHASE_ID_PATTERN)
+    valid = parts.notna().all(axis=1).to_numpy()
+    member = pd.to_numeric(parts[3], errors="coerce").astype("Int64").astype("string").str.zfill(4)
+    sequence = pd.to_numeric(parts[4], errors="coerce").astype("Int64").astype("string")
+    key = parts[0] + "-" + parts[1] + "-" + parts[2] + "-" + member + "-" + sequence
+    return key.astype(object).where(valid, None)
+
+
+def split_resident_no(series):
+    # 주민번호 앞 6자리 -> 생년월일 (YYYY-MM-DD), 뒷자리 첫 숫자 -> 성별
+    # 연도 앞 두 자리는 뒷자리 첫 숫자로 정하고, 그 숫자를 모르거나 없는 날짜 (1900-02-29 등) 는 NULL
+    text = series.astype("string").str.strip()
+    front = text.str[:6]
+    digit = text.str[6:].str.lstrip("-").str[:1]
+    century = digit.map(CENTURY_MAPPING)
+    valid = ((front.str.len().fillna(0) >= 6) & century.notna()).to_numpy()
+
+    # pandas 문자열 이어 붙이기는 행마다 새 문자열을 만들어 느리므로
+    # 고정 길이 유니코드 배열을 코드포인트(uint32) 행렬로 보고 열 단위로 복사해 "YYYY-MM-DD" 를 만든다
+    codes = front.fillna("").to_numpy(dtype="U6").view(np.uint32).reshape(-1, 6)
+    centuries = century.fillna("00").to_numpy(dtype="U2").view(np.uint32).reshape(-1, 2)
+    out = np.empty((len(codes), 10), dtype=np.uint32)
+    out[:, 4], out[:, 7] = ord("-"), ord("-")
+    out[:, 0:2], out[:, 2:4], out[:, 5:7], out[:, 8:10] = centuries, codes[:, 0:2], codes[:, 2:4], codes[:, 4:6]
+    dob = pd.Series(out.view("U10").ravel(), index=series.index).astype(object)
+    valid &= pd.to_datetime(dob, format="%Y-%m-%d", errors="coerce").notna().to_numpy()
+
+    gender = digit.map(GENDER_MAPPING).astype(object)
+    return dob.where(valid, None), gender.where(gender.notna(), None)
+
+
+CLEANERS = {
+    "text": clean_text,
+    "count": clean_count,
+    "amount": clean_amount,
+    "flag": clean_flag,
+    "date": clean_date,
+    "category": clean_category,
+    "resident_no": split_resident_no,
+    "purchase_id": clean_purchase_id,
+}
+
+
+def apply_spec(df, spec):
+    # 원본 DataFrame 을 spec 의 대상 열만 가진 정리된 DataFrame 으로 변환
+    # (원본에 없는 열은 빈 값으로 보고 변환한다)
+    sources = {header_key(column): column for column in df.columns}
+    cleaned = {}
+    for target, aliases, column_type in spec:
+        source = next((sources[header_key(alias)] for alias in aliases if header_key(alias) in sources), None)
+        series = df[source] if source is not None else pd.Series(None, index=df.index, dtype=object)
+        result = CLEANERS[column_type](series)
+        if isinstance(target, tuple):
+            cleaned.update(zip(target, result))
+        else:
+            cleaned[target] = result
+    return pd.DataFrame(cleaned, index=df.index)
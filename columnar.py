@@ -0,0 +1,171 @@
+import os
+import tempfile
+
+from db import jdbc_connection, server_is_local
+from metrics import timer
+from startup import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# 조회 결과를 행 튜플 대신 열 단위로 받아 NumPy 배열 / DataFrame 으로 만드는 읽기 API
+# jaydebeapi 의 fetchall 은 행마다 JPype 로 값을 변환해 튜플을 만들므로 큰 결과에서 느리고 메모리를 많이 쓴다
+# - csv: H2 가 CSVWRITE 로 결과를 임시 파일에 한 번에 쓰고 pandas 가 C 파서로 열 단위로 읽는다
+#        (가장 빠르지만 H2 가 같은 파일 시스템을 봐야 하고, ? 인자를 쓸 수 없다)
+# - jdbc: fetch_size 행씩 받아 열마다 타입에 맞는 getter 로 읽고 블록마다 NumPy 배열로 변환
+# method 를 지정하지 않으면 가능한 경우 csv, 아니면 jdbc 를 쓴다
+# 열 이름은 소문자로 돌려준다 (H2 는 따옴표 없는 이름을 대문자로 저장한다)
+FETCH_SIZE = 10000
+
+# java.sql.Types 값 -> 열 종류
+SQL_KINDS = {
+    -7: "bool", 16: "bool",
+    -6: "int", 5: "int", 4: "int", -5: "int",
+    6: "float", 7: "float", 8: "float", 2: "float", 3: "float",
+    91: "date", 93: "timestamp", 2014: "timestamptz",
+}
+
+# 문자열로 받아 pandas 로 변환하는 날짜/시각 종류 (timestamptz 는 UTC 로 맞춘다)
+DATE_KINDS = ("date", "timestamp", "timestamptz")
+
+# ResultSetMetaData.columnNoNulls
+NO_NULLS = 0
+
+
+def _columns(metadata):
+    # [(열 이름, 종류, NULL 가능 여부), ...]
+    return [(str(metadata.getColumnLabel(i)).lower(), SQL_KINDS.get(int(metadata.getColumnType(i)), "text"),
+             int(metadata.isNullable(i)) != NO_NULLS)
+            for i in range(1, metadata.getColumnCount() + 1)]
+
+
+def _block_array(kind, values):
+    # 한 블록의 열 값 리스트 -> NumPy 배열 (NULL 위치는 따로 모은 마스크로 표시한다)
+    if kind == "int":
+        return np.array(values, dtype=np.int64)
+    if kind == "float":
+        return np.array(values, dtype=np.float64)
+    if kind == "bool":
+        return np.array(values, dtype=bool)
+    return np.array(values, dtype=object)
+
+
+def _finish(kind, array, mask):
+    # 열 전체 배열 -> pandas 열 (NULL 이 있는 정수/불리언은 nullable 타입, 날짜는 datetime64)
+    if kind == "int":
+        return pd.arrays.IntegerArray(array, mask) if mask.any() else array
+    if kind == "float":
+        return np.where(mask, np.nan, array)
+    if kind == "bool":
+        return pd.arrays.BooleanArray(array, mask) if mask.any() else array
+    if kind in DATE_KINDS:
+        return pd.to_datetime(pd.Series(array, dtype=object), errors="coerce", utc=kind == "timestamptz")
+    # 문자열은 csv 방식과 같이 object 열로 둔다
+    return pd.Series(array, dtype=object)
+
+
+def _read_jdbc(cursor, query, params=None, fetch_size=FETCH_SIZE):
+    # fetch_size 행씩 받아 열마다 NumPy 배열로 쌓는다 (행 튜플을 만들지 않는다)
+    statement = jdbc_connection(cursor).prepareStatement(query)
+    try:
+        statement.setFetchSize(fetch_size)
+        for position, value in enumerate(params or (), 1):
+            statement.setObject(position, value)
+        result = statement.executeQuery()
+        columns = _columns(result.getMetaData())
+        getters = []
+        for _, kind, _ in columns:
+            # 숫자/불리언은 기본 타입 getter 로 바로 파이썬 값을 받고 NULL 은 wasNull 로 확인
+            getters.append({"int": result.getLong, "float": result.getDouble,
+                            "bool": result.getBoolean}.get(kind, result.getString))
+        blocks = [([], []) for _ in columns]
+        while True:
+            values = [[] for _ in columns]
+            nulls = [[] for _ in columns]
+            rows = 0
+            while rows < fetch_size and result.next():
+                rows += 1
+                for i, (_, kind, nullable) in enumerate(columns):
+                    value = getters[i](i + 1)
+                    if kind in ("int", "float", "bool"):
+                        nulls[i].append(nullable and result.wasNull())
+                    else:
+                        nulls[i].append(value is None)
+                        value = None if value is None else str(value)
+                    values[i].append(value)
+            for i, (_, kind, _) in enumerate(columns):
+                blocks[i][0].append(_block_array(kind, values[i]))
+                blocks[i][1].append(np.array(nulls[i], dtype=bool))
+            if rows < fetch_size:
+                break
+    finally:
+        statement.close()
+    data = {}
+    for (name, kind, _), (arrays, masks) in zip(columns, blocks):
+        data[name] = _finish(kind, np.concatenate(arrays), np.concatenate(masks))
+    return pd.DataFrame(data)
+
+
+def _read_csv(cursor, query):
+    # H2 가 CSVWRITE 로 결과를 임시 파일에 쓰고, 열 타입은 준비된 문장의 메타데이터로 정한다
+    statement = jdbc_connection(cursor).prepareStatement(query)
+    try:
+        columns = _columns(statement.getMetaData())
+    finally:
+        statement.close()
+    fd, csv_path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        quoted_path = csv_path.replace("'", "''")
+        quoted_query = query.replace("'", "''")
+        cursor.execute(f"CALL CSVWRITE('{quoted_path}', '{quoted_query}', 'charset=UTF-8')")
+        names = [name for name, _, _ in columns]
+        dtypes = {name: {"int": "Int64", "float": "float64", "bool": "boolean"}.get(kind, object)
+                  for name, kind, _ in columns if kind not in DATE_KINDS}
+        df = pd.read_csv(csv_path, encoding="utf-8", header=0, names=names, dtype=dtypes,
+                         keep_default_na=False, na_values=[""], true_values=["TRUE"], false_values=["FALSE"])
+    finally:
+        os.remove(csv_path)
+    for name, kind, _ in columns:
+        if kind in DATE_KINDS:
+            df[name] = pd.to_datetime(df[name], errors="coerce", utc=kind == "timestamptz")
+        elif kind in ("int", "bool") and not df[name].hasnans:
+            # NULL 이 없으면 jdbc 방식과 같은 NumPy 타입으로 맞춘다
+            df[name] = df[name].to_numpy(dtype=np.int64 if kind == "int" else bool)
+    return df
+
+
+def read_sql(cursor, query, params=None, fetch_size=FETCH_SIZE, method=None):
+    # query 결과를 DataFrame 으로 반환
+    if method is None:
+        method = "csv" if not params and server_is_local() else "jdbc"
+    with timer(f"h2_read_{method}"):
+        if method == "csv":
+            if params:
+                raise ValueError("csv 방식은 ? 인자를 쓸 수 없습니다")
+            return _read_csv(cursor, query)
+        return _read_jdbc(cursor, query, params, fetch_size)
+
+
+def read_table(cursor, table, columns=None, where=None, params=None, **options):
+    # 테이블 (또는 where 조건에 맞는 행) 의 열을 DataFrame 으로 반환
+    query = f"SELECT {', '.join(columns) if columns else '*'} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    return read_sql(cursor, query, params, **options)
+
+
+def read_arrays(cursor, query, params=None, **options):
+    # query 결과를 {열 이름: NumPy 배열} 로 반환
+    df = read_sql(cursor, query, params, **options)
+    return {name: df[name].to_numpy() for name in df.columns}
+
+
+def export_csv(cursor, query, path):
+    # query 결과를 H2 가 직접 CSV 파일로 저장 (리포트용 전체 내보내기, 파이썬을 거치지 않는다)
+    # path 는 H2 서버 기준 경로, 반환값: 저장한 행 수
+    quoted_path = os.path.abspath(path).replace("'", "''") if server_is_local() else path.replace("'", "''")
+    quoted_query = query.replace("'", "''")
+    with timer("h2_csvwrite"):
+        cursor.execute(f"CALL CSVWRITE('{quoted_path}', '{quoted_query}', 'charset=UTF-8')")
+        return int(str(cursor.fetchone()[0]))
@@ -0,0 +1,107 @@
+import os
+
+from load_manifest import file_hash
+from metrics import timer
+from startup import lazy_import
+
+# 정리된 CSV 프레임을 Arrow IPC(Feather v2) 파일로 보관하는 캐시
+# - 파일 이름에 원본 파일의 해시가 들어가므로 원본이 바뀌면 자동으로 새로 만든다
+# - 읽을 때는 메모리 매핑으로 열어 CSV 파싱/정리를 건너뛴다
+# - 전체 크기가 CACHE_LIMIT 를 넘으면 가장 오래 쓰지 않은 파일부터 지운다 (LRU)
+# pyarrow 가 없거나 CSV_CACHE=0 이면 캐시 없이 매번 CSV 를 읽는다
+# (설정은 프로세스 풀의 작업 프로세스에도 전달되도록 환경 변수로 받는다)
+# pyarrow 는 캐시를 처음 읽거나 쓸 때 불러온다
+pa = lazy_import("pyarrow")
+
+CACHE_DIR_ENV = "CSV_CACHE_DIR"
+CACHE_ENABLED_ENV = "CSV_CACHE"
+CACHE_LIMIT = 256 * 2 ** 20
+# 정리 규칙(column_spec)이 바뀌면 올려서 예전 캐시를 쓰지 않게 한다
+CACHE_VERSION = 3
+CACHE_SUFFIX = ".arrow"
+
+
+def cache_dir():
+    return os.environ.get(CACHE_DIR_ENV, os.path.abspath("cache"))
+
+
+def cache_enabled():
+    return pa is not None and os.environ.get(CACHE_ENABLED_ENV, "1") != "0"
+
+
+def _cache_prefix(parse_func, file_path):
+    # 같은 원본/정리 함수의 캐시 파일은 이 접두어를 공유한다 (원본이 바뀌면 예전 파일을 지울 때 사용)
+    return f"{parse_func.__name__}-{os.path.basename(file_path)}-"
+
+
+def _read_cache(path):
+    with timer("cache_read"):
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        # LRU 순서를 위해 사용 시각 갱신
+        os.utime(path)
+        return table.to_pandas()
+
+
+def _write_cache(path, df):
+    # 다른 작업 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔 넣는다
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(temp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, path)
+
+
+def _remove(path):
+    # 다른 프로세스가 열어 둔 파일 (Windows) 은 지우지 못하므로 다음 정리 때 다시 시도한다
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def evict(limit=CACHE_LIMIT):
+    # 캐시 전체 크기가 limit 이하가 될 때까지 가장 오래 쓰지 않은 파일부터 삭제
+    directory = cache_dir()
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(CACHE_SUFFIX):
+            stat = os.stat(os.path.join(directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= limit:
+            break
+        if _remove(os.path.join(directory, name)):
+            total -= size
+
+
+def cached_frame(parse_func, file_path):
+    # parse_func(file_path) 결과를 캐시에서 읽거나, 없으면 만들어 캐시에 저장한 뒤 반환
+    if not cache_enabled():
+        return parse_func(file_path)
+
+    directory = cache_dir()
+    prefix = _cache_prefix(parse_func, file_path)
+    path = os.path.join(directory, f"{prefix}v{CACHE_VERSION}-{file_hash(file_path)}{CACHE_SUFFIX}")
+    if os.path.exists(path):
+        try:
+            return _read_cache(path)
+        except Exception as e:
+            print(f"캐시 읽기 실패, CSV 를 다시 읽습니다: {path}, {e}")
+
+    df = parse_func(file_path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # 원본이 바뀌어 더 이상 쓰지 않는 예전 캐시 삭제
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name.endswith(CACHE_SUFFIX) and name != os.path.basename(path):
+                _remove(os.path.join(directory, name))
+        with timer("cache_write"):
+            _write_cache(path, df)
+        evict()
+    except Exception as e:
+        print(f"캐시 저장 실패: {path}, {e}")
+    return df
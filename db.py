@@ -0,0 +1,191 @@
+import os
+import time
+import queue
+import threading
+import contextlib
+
+from metrics import timer
+from startup import is_loaded, lazy_import, record
+
+# JVM 을 띄우는 단계에서 처음 불러온다 (시작 시간 단축)
+jpype = lazy_import("jpype")
+jaydebeapi = lazy_import("jaydebeapi")
+
+# H2 연결 관리
+# JVM 은 프로세스에서 한 번만 시작하고, JDBC 연결은 작은 풀에 보관해 여러 로더가 재사용한다
+DRIVER = "org.h2.Driver"
+POOL_SIZE = 2
+
+# 접속 대상 (--db 옵션이나 H2_DB_URL 환경 변수에 이름 또는 JDBC URL 을 지정)
+# tcp: 외부 H2 서버, file: 서버 없이 같은 DB 파일을 직접 열기 (서버가 떠 있으면 파일이 잠겨 있다),
+# mem: 프로세스 안의 메모리 DB (마지막 연결이 닫혀도 JVM 이 끝날 때까지 유지)
+DB_URL_ENV = "H2_DB_URL"
+DB_TARGETS = {
+    "tcp": "jdbc:h2:tcp://localhost/~/test",
+    "file": "jdbc:h2:file:~/test",
+    "mem": "jdbc:h2:mem:test;DB_CLOSE_DELAY=-1",
+}
+
+
+def resolve_url(target):
+    # 접속 대상 이름을 JDBC URL 로 변환 (이미 URL 이면 그대로 사용)
+    return DB_TARGETS.get(target, target)
+
+
+def default_url():
+    # 환경 변수에 지정된 접속 대상 (없으면 TCP 서버)
+    return resolve_url(os.environ.get(DB_URL_ENV, "tcp"))
+
+
+settings = {
+    "jar_path": None,
+    "url": default_url(),
+    "username": "sa",
+    "password": "",
+    "pool_size": POOL_SIZE,
+}
+
+_idle = queue.Queue()
+_lock = threading.Lock()
+_created = 0
+
+
+def configure(jar_path, url=None, username=None, password=None, pool_size=None):
+    # 연결 정보 설정 (이미 만든 연결에는 영향이 없으므로 첫 연결 전에 호출한다)
+    settings["jar_path"] = jar_path
+    for key, value in (("url", url), ("username", username), ("password", password), ("pool_size", pool_size)):
+        if value is not None:
+            settings[key] = value
+
+
+def start_jvm():
+    # JVM 시작 (이미 떠 있으면 그대로 사용)
+    if not jpype.isJVMStarted():
+        start = time.perf_counter()
+        jpype.startJVM(classpath=[settings["jar_path"]])
+        record("JVM 시작", time.perf_counter() - start)
+
+
+def _connect():
+    start_jvm()
+    start = time.perf_counter()
+    conn = jaydebeapi.connect(DRIVER, settings["url"], [settings["username"], settings["password"]],
+                              settings["jar_path"])
+    # 커밋 시점은 로더가 정한다 (JDBC 기본값인 autocommit 에서는 롤백과 세이브포인트를 쓸 수 없다)
+    conn.jconn.setAutoCommit(False)
+    record("DB 연결", time.perf_counter() - start)
+    return conn
+
+
+def _acquire():
+    # 쉬고 있는 연결을 꺼내고, 없으면 pool_size 까지 새로 만들고, 그 이상이면 반납될 때까지 기다린다
+    global _created
+    try:
+        return _idle.get_nowait()
+    except queue.Empty:
+        pass
+    with _lock:
+        if _created < settings["pool_size"]:
+            _created += 1
+            try:
+                return _connect()
+            except Exception:
+                _created -= 1
+                raise
+    return _idle.get()
+
+
+@contextlib.contextmanager
+def connection():
+    # 풀에서 연결을 빌려 주고, 블록이 정상 종료되면 커밋, 예외가 나면 롤백한 뒤 반납
+    conn = _acquire()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _idle.put(conn)
+
+
+@contextlib.contextmanager
+def transaction():
+    # connection() 과 같지만 커서를 넘겨 준다
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+
+def _connection_of(cursor):
+    # 커서를 만든 연결 (jaydebeapi 커서는 자신의 연결을 공개 속성으로 노출하지 않는다)
+    return cursor._connection
+
+
+def jdbc_connection(cursor):
+    # 커서를 만든 연결의 java.sql.Connection (JDBC API 를 직접 쓸 때)
+    return _connection_of(cursor).jconn
+
+
+def server_is_local():
+    # H2 가 이 컴퓨터의 파일 시스템을 보는지 (임시 파일을 주고받는 CSVREAD/CSVWRITE 적재/조회에 필요)
+    url = settings["url"]
+    if url.startswith("jdbc:h2:tcp://") or url.startswith("jdbc:h2:ssl://"):
+        host = url.split("//", 1)[1].split("/", 1)[0].split(":", 1)[0]
+        return host in ("localhost", "127.0.0.1")
+    return True
+
+
+def commit(cursor):
+    # 커서를 만든 연결을 커밋 (파일 단위 체크포인트, 중간 커밋용)
+    with timer("commit"):
+        _connection_of(cursor).commit()
+
+
+def set_savepoint(cursor):
+    # 현재 트랜잭션 안에 JDBC 세이브포인트를 만든다
+    return _connection_of(cursor).jconn.setSavepoint()
+
+
+def rollback_to_savepoint(cursor, savepoint):
+    # 세이브포인트 이후의 변경만 되돌린다 (그 이전 변경과 트랜잭션은 유지)
+    _connection_of(cursor).jconn.rollback(savepoint)
+
+
+def release_savepoint(cursor, savepoint):
+    # 세이브포인트 해제 (이후에 만든 세이브포인트도 함께 해제된다)
+    _connection_of(cursor).jconn.releaseSavepoint(savepoint)
+
+
+def detach_thread():
+    # 현재 스레드를 JVM 에서 분리 (JDBC 를 쓴 보조 스레드가 끝나기 전에 호출)
+    # 분리하지 않고 끝난 스레드가 있으면 shutdown() 의 JVM 종료가 그 스레드를 기다리며 멈춘다
+    if is_loaded(jpype) and jpype.isJVMStarted():
+        jpype.java.lang.Thread.detach()
+
+
+def close_all():
+    # 풀에 반납된 연결을 모두 닫는다
+    global _created
+    while True:
+        try:
+            conn = _idle.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            conn.close()
+        except Exception as e:
+            print(f"연결 종료 중 오류 발생: {e}")
+        with _lock:
+            _created -= 1
+
+
+def shutdown():
+    # 연결을 모두 닫고 JVM 종료 (프로그램 끝에서 한 번만 호출)
+    close_all()
+    # JVM 을 띄운 적이 없으면 jpype 를 불러오지 않고 끝낸다
+    if is_loaded(jpype) and jpype.isJVMStarted():
+        jpype.shutdownJVM()
@@ -0,0 +1,241 @@
+import os
+import re
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from bulk_insert import BATCH_SIZE, insert_dataframe, merge_dataframe
+from integrity import reference_keys, split_orphans
+from load_manifest import file_hash
+from pipeline import parse_files
+from rejects import clear_rejects, record_rejects
+from startup import lazy_import
+
+pd = lazy_import("pandas")
+# 썸네일용 (선택 의존성, 없으면 원본만 저장하고 썸네일은 만들지 않는다)
+Image = lazy_import("PIL.Image")
+
+# 상품 이미지 폴더를 image_table 로 적재
+# - 폴더 아래 이미지 파일을 모두 찾고, 크기/수정 시각이 image_manifest 기록과 다른 파일만 스레드 풀에서 해시한다
+#   (시각만 바뀌고 내용이 같은 파일은 기록만 갱신)
+# - 원본은 내용 해시로 정한 경로 (저장 폴더/해시 앞 2자리/해시.확장자) 에 한 번만 복사한다
+#   (내용이 같은 이미지는 여러 상품/경로에서 쓰여도 파일 하나를 같이 쓴다)
+# - 썸네일은 프로세스 풀에서 만든다 (저장 폴더/thumbs/해시 앞 2자리/해시.jpg)
+# - 상품 코드는 파일 이름 (A1.jpg, A1_2.png) 이나 상위 폴더 이름 (A1/front.jpg) 에서 찾는다
+# - 폴더에서 사라진 파일의 행은 지우지 않고 delete 를 TRUE 로 바꾼다
+# origin_path 는 이미지 폴더 기준 상대 경로 ('/' 구분) 로 보관한다 (다른 컴퓨터에서 다시 실행해도 같은 키)
+# 거부된 이미지는 기록하지 않으므로 다음 실행에서 다시 처리된다 (load_rejects 의 source 는 이미지 폴더 이름)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
+IMAGE_STORE_ENV = "IMAGE_STORE_DIR"
+THUMBNAIL_SIZE = (256, 256)
+HASH_THREADS = 8
+
+# 파일/폴더 이름 앞부분의 상품 코드 (A1, C12 ...)
+PRODUCT_CODE_PATTERN = re.compile(r"^([A-Za-z]\d+)(?:[_\-\s.(].*)?$")
+
+IMAGE_MANIFEST_SQL = """
+CREATE TABLE IF NOT EXISTS image_manifest (
+    origin_path VARCHAR(255) PRIMARY KEY,
+    size BIGINT NOT NULL,
+    mtime BIGINT NOT NULL,
+    hash VARCHAR(64) NOT NULL,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+MANIFEST_MERGE_SQL = """
+MERGE INTO image_manifest (origin_path, size, mtime, hash, loaded_at)
+KEY (origin_path) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+def create_image_tables(cursor):
+    cursor.execute(IMAGE_MANIFEST_SQL)
+
+
+def image_store_dir():
+    return os.environ.get(IMAGE_STORE_ENV, os.path.abspath("image_store"))
+
+
+def product_code(relative_path):
+    # 파일 이름, 없으면 가까운 상위 폴더부터 이름에서 상품 코드를 찾는다 (못 찾으면 None)
+    parts = relative_path.split("/")
+    names = [os.path.splitext(parts[-1])[0]] + parts[-2::-1]
+    for name in names:
+        match = PRODUCT_CODE_PATTERN.match(name)
+        if match:
+            return match.group(1).upper()
+    return None
+
+
+def scan_images(root):
+    # 이미지 파일 목록 [(상대 경로, 절대 경로, 크기, 수정 시각 ns), ...]
+    found = []
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            found.append((relative, path, stat.st_size, stat.st_mtime_ns))
+    return sorted(found)
+
+
+def read_image_manifest(cursor):
+    # {상대 경로: (size, mtime, hash)}
+    cursor.execute("SELECT origin_path, size, mtime, hash FROM image_manifest")
+    return {str(path): (int(str(size)), int(str(mtime)), str(digest))
+            for path, size, mtime, digest in cursor.fetchall()}
+
+
+def hash_files(paths, threads=HASH_THREADS):
+    # 파일 해시를 스레드 풀에서 계산 (hashlib 은 큰 블록을 해시하는 동안 GIL 을 놓는다)
+    with metrics.timer("image_hash"), ThreadPoolExecutor(max_workers=threads) as pool:
+        return dict(zip(paths, pool.map(file_hash, paths)))
+
+
+def content_path(digest, extension):
+    return os.path.join(image_store_dir(), digest[:2], digest + extension.lower())
+
+
+def thumbnail_path(save_path):
+    digest = os.path.splitext(os.path.basename(save_path))[0]
+    return os.path.join(image_store_dir(), "thumbs", digest[:2], digest + ".jpg")
+
+
+def _write_atomic(path, write):
+    # 임시 이름으로 쓴 뒤 바꿔서, 중간에 끊겨도 반쯤 쓴 파일이 남지 않게 한다
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.{os.getpid()}.partial"
+    try:
+        write(partial)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def store_file(source, save_path):
+    # 내용 주소 경로에 원본 복사 (이미 있으면 같은 내용이므로 건너뛰고 False 반환)
+    if os.path.exists(save_path):
+        return False
+
+    def copy(partial):
+        with open(source, "rb") as src, open(partial, "wb") as dst:
+            for block in iter(lambda: src.read(1 << 20), b""):
+                dst.write(block)
+
+    _write_atomic(save_path, copy)
+    return True
+
+
+def make_thumbnail(save_path):
+    # 저장된 원본으로 썸네일을 만들고 경로를 반환 (프로세스 풀에서 실행하므로 모듈 최상위 함수)
+    path = thumbnail_path(save_path)
+    if os.path.exists(path):
+        return path
+
+    def write(partial):
+        with Image.open(save_path) as image:
+            image = image.convert("RGB")
+            image.thumbnail(THUMBNAIL_SIZE)
+            image.save(partial, "JPEG", quality=85)
+
+    _write_atomic(path, write)
+    return path
+
+
+def make_thumbnails(save_paths, workers=1):
+    # 썸네일을 workers 개의 프로세스에서 만들고 만든 수를 반환 (Pillow 가 없으면 건너뜀)
+    if not save_paths:
+        return 0
+    if Image is None:
+        print("Pillow 가 설치되어 있지 않아 썸네일을 만들지 않습니다")
+        return 0
+    made = 0
+    with metrics.timer("thumbnail"):
+        for save_path, _, error in parse_files(make_thumbnail, save_paths, workers):
+            if error is not None:
+                print(f"썸네일 생성 중 오류 발생: {save_path}, 오류 메시지: {error}")
+            else:
+                made += 1
+    return made
+
+
+@metrics.stage("load_images")
+def load_images(cursor, root, product_index, batch_size=BATCH_SIZE, workers=1):
+    # root 폴더의 새 이미지와 바뀐 이미지를 저장하고 image_table 에 반영
+    if not os.path.isdir(root):
+        print(f"이미지 폴더가 없습니다: {root}")
+        return
+    print(f"이미지 폴더 확인 중: {root}")
+    files = scan_images(root)
+    metrics.count("image_table", root, "read", len(files))
+    manifest = read_image_manifest(cursor)
+    clear_rejects(cursor, "image_table", root)
+
+    # 크기/수정 시각이 같으면 해시하지 않고, 해시가 같으면 기록만 갱신
+    candidates = [entry for entry in files if manifest.get(entry[0], ())[:2] != (entry[2], entry[3])]
+    hashes = hash_files([path for _, path, _, _ in candidates])
+    touched = []
+    rows = []
+    for relative, path, size, mtime in candidates:
+        digest = hashes[path]
+        if relative in manifest and manifest[relative][2] == digest:
+            touched.append((relative, size, mtime, digest))
+            continue
+        rows.append({"origin_path": relative, "source": path, "size": size, "mtime": mtime, "hash": digest,
+                     "code": product_code(relative),
+                     "save_path": content_path(digest, os.path.splitext(relative)[1])})
+    if touched:
+        cursor.executemany(MANIFEST_MERGE_SQL, touched)
+
+    today = datetime.date.today().isoformat()
+    df = pd.DataFrame(rows, columns=["origin_path", "source", "size", "mtime", "hash", "code", "save_path"])
+    df = df.assign(product_no=df["code"].map(product_index), save_date=today, update_date=today, delete=False)
+
+    # 상품 코드를 찾지 못했거나 등록되지 않은 상품의 이미지는 거부
+    unknown = df["product_no"].isna()
+    rejected = [(idx, f"상품 코드를 찾을 수 없는 이미지: {df.at[idx, 'origin_path']}") for idx in df.index[unknown]]
+    if rejected:
+        print(f"상품을 찾을 수 없는 이미지 {len(rejected)}건 제외 (load_rejects 에 기록)")
+    record_rejects(cursor, "image_table", df, rejected, root)
+    df = df[~unknown].astype({"product_no": int})
+    df, orphans = split_orphans(df, "image_table", reference_keys(cursor, "image_table"))
+    record_rejects(cursor, "image_table", df, orphans, root)
+
+    # 내용이 같은 파일은 한 번만 복사 (원본 복사는 I/O 이므로 스레드 풀)
+    unique = df.drop_duplicates("save_path")
+    with metrics.timer("image_store"), ThreadPoolExecutor(max_workers=HASH_THREADS) as pool:
+        stored = sum(pool.map(store_file, unique["source"], unique["save_path"]))
+    thumbnails = make_thumbnails(unique["save_path"].tolist(), workers)
+
+    # 이미 있는 origin_path 는 저장 경로만 갱신 (save_date 유지), 새 경로는 삽입
+    cursor.execute("SELECT origin_path FROM image_table")
+    existing = {str(row[0]) for row in cursor.fetchall()}
+    is_new = ~df["origin_path"].isin(existing)
+    inserted, errors = insert_dataframe(cursor, "image_table", ["product_no", "origin_path", "save_path", "save_date",
+                                                                "update_date", "delete"], df[is_new], batch_size)
+    updated, update_errors = merge_dataframe(cursor, "image_table", ["origin_path", "product_no", "save_path",
+                                                                     "update_date", "delete"],
+                                             "origin_path", df[~is_new], batch_size)
+    errors += update_errors
+    for idx, error in errors:
+        print(f"이미지 삽입 오류: {error} | 파일: {df.at[idx, 'origin_path']}")
+    record_rejects(cursor, "image_table", df, errors, root)
+    failed = {idx for idx, _ in errors}
+    done = df[~df.index.isin(failed)]
+    cursor.executemany(MANIFEST_MERGE_SQL, list(zip(done["origin_path"], done["size"].astype(int).tolist(),
+                                                    done["mtime"].astype(int).tolist(), done["hash"])))
+    metrics.count("image_table", root, "inserted", inserted + updated)
+
+    # 폴더에서 사라진 이미지는 delete 표시 후 기록에서 뺀다
+    scanned = {relative for relative, _, _, _ in files}
+    removed = [(relative,) for relative in manifest if relative not in scanned]
+    if removed:
+        cursor.executemany("UPDATE image_table SET delete = TRUE, update_date = CURRENT_DATE WHERE origin_path = ?",
+                           removed)
+        cursor.executemany("DELETE FROM image_manifest WHERE origin_path = ?", removed)
+    print(f"이미지 적재 완료: 신규 {inserted}건, 변경 {updated}건, 그대로 {len(files) - len(candidates) + len(touched)}건, "
+          f"삭제 {len(removed)}건, 새로 저장한 파일 {stored}개, 썸네일 {thumbnails}개")
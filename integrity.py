@@ -0,0 +1,43 @@
+from columnar import read_arrays
+from startup import lazy_import
+
+np = lazy_import("numpy")
+
+# 삽입 전 참조 무결성 (외래 키) 검사
+# 참조하는 행이 없는 값은 H2 에서 FK 오류가 되어 JPype 예외로 한 행씩 올라오고, 배치가 실패하면 행 단위 재시도로 바뀌어 느리다
+# 참조 대상 키를 한 번에 읽어 두고 DataFrame (파일 전체 또는 청크) 마다 np.isin 으로 걸러내
+# 걸린 행은 load_rejects 에 한 번에 기록하고, 삽입 배치에는 유효한 행만 보낸다
+# (NULL 은 FK 검사 대상이 아니므로 통과시킨다)
+
+# 테이블 -> [(열, 참조 테이블, 참조 열), ...]
+FOREIGN_KEYS = {
+    "product_table": [("category_no", "category_table", "category_no")],
+    "buy_table": [("member_no", "member_table", "member_no"), ("product_no", "product_table", "product_no")],
+    "image_table": [("product_no", "product_table", "product_no")],
+}
+
+
+def reference_keys(cursor, table):
+    # table 의 외래 키 열마다 참조 대상 키 배열 {열: 정렬된 고유 키 배열}
+    # (적재 중에 참조 대상이 바뀌지 않는 동안 재사용한다)
+    keys = {}
+    for column, ref_table, ref_column in FOREIGN_KEYS.get(table, []):
+        values = read_arrays(cursor, f"SELECT {ref_column} FROM {ref_table}")[ref_column.lower()]
+        keys[column] = np.unique(values)
+    return keys
+
+
+def split_orphans(df, table, keys):
+    # 참조하는 행이 있는 행만 남긴 DataFrame 과 [(행 인덱스, 이유), ...] 를 반환
+    orphan = np.zeros(len(df), dtype=bool)
+    errors = []
+    for column, ref_table, _ in FOREIGN_KEYS.get(table, []):
+        if column not in keys or column not in df.columns:
+            continue
+        values = df[column]
+        missing = values.notna().to_numpy() & ~np.isin(values.to_numpy(), keys[column]) & ~orphan
+        # 한 행에 이유는 하나만 남긴다 (앞 열에서 이미 걸린 행은 건너뜀)
+        errors += [(idx, f"{ref_table} 에 없는 {column}: {value}")
+                   for idx, value in zip(df.index[missing], values[missing].tolist())]
+        orphan |= missing
+    return df[~orphan], errors
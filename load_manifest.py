@@ -0,0 +1,68 @@
+import os
+import hashlib
+
+# 적재한 CSV 파일의 상태를 기록하는 테이블
+# (EXE 는 실행할 때마다 임시 폴더에 풀리므로 전체 경로 대신 파일 이름을 키로 사용)
+MANIFEST_SQL = """
+CREATE TABLE IF NOT EXISTS load_manifest (
+    path VARCHAR(255) PRIMARY KEY,
+    size BIGINT NOT NULL,
+    mtime BIGINT NOT NULL,
+    hash VARCHAR(64) NOT NULL,
+    row_count INTEGER,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+MERGE_SQL = """
+MERGE INTO load_manifest (path, size, mtime, hash, row_count, loaded_at)
+KEY (path) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+def create_manifest_table(cursor):
+    cursor.execute(MANIFEST_SQL)
+
+
+def file_hash(file_path, block_size=1 << 20):
+    # 파일 내용의 SHA-256 해시 (큰 파일도 블록 단위로 읽는다)
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(cursor):
+    # {파일 이름: (size, mtime, hash)}
+    cursor.execute("SELECT path, size, mtime, hash FROM load_manifest")
+    return {str(path): (int(size), int(mtime), str(digest)) for path, size, mtime, digest in cursor.fetchall()}
+
+
+def pending_files(cursor, file_paths):
+    # 새로 생겼거나 내용이 바뀐 파일만 반환
+    # 크기와 수정 시각이 같으면 해시 계산을 건너뛰고, 시각만 바뀐 파일은 기록만 갱신한다
+    manifest = read_manifest(cursor)
+    pending = []
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            continue
+        stat = os.stat(file_path)
+        recorded = manifest.get(os.path.basename(file_path))
+        if recorded and recorded[:2] == (stat.st_size, stat.st_mtime_ns):
+            continue
+        digest = file_hash(file_path)
+        if recorded and recorded[2] == digest:
+            cursor.execute("UPDATE load_manifest SET size = ?, mtime = ? WHERE path = ?",
+                           (stat.st_size, stat.st_mtime_ns, os.path.basename(file_path)))
+            continue
+        pending.append(file_path)
+    return pending
+
+
+def record_file(cursor, file_path, row_count):
+    # 파일 하나의 적재를 커밋하기 직전에 같은 트랜잭션에서 호출해 체크포인트를 남긴다
+    # (데이터와 기록이 함께 커밋되거나 함께 롤백된다)
+    stat = os.stat(file_path)
+    cursor.execute(MERGE_SQL, (os.path.basename(file_path), stat.st_size, stat.st_mtime_ns,
+                               file_hash(file_path), int(row_count)))
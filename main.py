@@ -1,8 +1,35 @@
+# 시작 시간 측정 기준 시각이 되도록 가장 먼저 import 한다
+from startup import lazy_import, mark, print_report
+
 import os
+import re
 import sys
-import jpype
-import jaydebeapi
-import pandas as pd
+import time
+import argparse
+import tracemalloc
+import multiprocessing
+
+# CSV 를 읽는 단계에서 처음 불러온다 (바뀐 파일이 없으면 불러오지 않는다)
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+import metrics
+from cancellation import checkpoint
+from db import DB_TARGETS, commit, configure, default_url, resolve_url, shutdown, transaction
+import bulk_insert
+from csv_cache import CACHE_ENABLED_ENV, cached_frame
+from columnar import read_table
+from column_spec import MEMBER_SPEC, PRODUCT_SPEC, PURCHASE_SPEC, apply_spec
+from bulk_insert import BATCH_SIZE, insert_dataframe, insert_via_csvread, merge_dataframe
+from image_loader import create_image_tables, load_images
+from integrity import reference_keys, split_orphans
+from load_manifest import create_manifest_table, pending_files, record_file
+from pipeline import parse_all, parse_files, run_with_writer
+from rejects import clear_rejects, create_rejects_table, record_rejects
+from sales_summary import create_summary_tables, purchase_months, refresh_summary, year_months
+from schema import create_indexes, current_version, drop_indexes, migrate
+from search_index import clear_indexes, mark_changed, refresh_indexes
+from snapshot import restore_snapshot, save_snapshot
 
 # 리소스 경로 처리 함수 (PyInstaller EXE에서 리소스 접근용)
 def resource_path(relative_path):
@@ -19,38 +46,59 @@ base_dir = resource_path(".")
 csv_folder = resource_path("csv")
 h2_jar_path = resource_path("jar/h2-2.3.232.jar")
 
-# H2 데이터베이스 연결 정보
-db_url = "jdbc:h2:tcp://localhost/~/test"
+# 적재 대상 CSV 파일
+product_file = os.path.join(csv_folder, "상품목록.csv")
+member_files = [os.path.join(csv_folder, f"회원목록_{year}년.csv") for year in range(2019, 2024)]
+purchase_files = [os.path.join(csv_folder, f"구매이력_{year}년.csv") for year in range(2019, 2024)]
+input_files = [product_file] + member_files + purchase_files
+
+# 상품 코드 (A1, C2, ...) -> product_no 매핑 (load_products / load_purchases 에서 갱신)
+product_index = {}
+
+# buy_table 외래 키가 참조하는 member_no / product_no 배열 (load_purchases 시작 시 한 번 읽는다)
+purchase_references = {}
+
+# 이번 실행에서 구매 이력이나 상품 정보가 바뀐 product_no (refresh_product_counters 에서 다시 집계)
+affected_products = set()
+
+# 이번 실행에서 구매 이력이 바뀐 달 ('YYYY-MM', refresh_sales_summary 에서 판매 요약을 다시 집계)
+affected_months = set()
+
+# H2 데이터베이스 연결 정보 (H2_DB_URL 환경 변수나 --db 옵션으로 변경)
+db_url = default_url()
 username = "sa"
 password = ""
 
 
-def initialize_database(cursor):
-    # 데이터베이스 초기화 및 테이블 생성
+@metrics.stage("initialize_database")
+def initialize_database(cursor, reset=True):
+    # 테이블 생성 (reset 이면 기존 객체를 모두 지우고 새로 만든다)
+    # 기존 DB 는 schema_version 에 기록된 버전부터 최신 스키마로 마이그레이션한다
     create_sql = """
-    CREATE TABLE member_table (
+    CREATE TABLE IF NOT EXISTS member_table (
         member_no INTEGER PRIMARY KEY AUTO_INCREMENT,
         id VARCHAR(50) NOT NULL UNIQUE,
         password VARCHAR(100) NOT NULL,
         name VARCHAR(100) NOT NULL,
-        dob VARCHAR(10),
+        dob DATE,
         gender VARCHAR(10) CHECK(gender IN ('남', '여')),
         address VARCHAR(255),
         email VARCHAR(100),
         phone VARCHAR(20),
         admin VARCHAR(10) CHECK (admin IN ('Y', 'N')),
-        joinDate VARCHAR(10),
-        delete VARCHAR(10) CHECK (delete IN ('True', 'False'))
+        joinDate DATE,
+        delete BOOLEAN
     );
 
-    CREATE TABLE category_table (
+    CREATE TABLE IF NOT EXISTS category_table (
         category_no INTEGER PRIMARY KEY AUTO_INCREMENT,
         name VARCHAR(100) NOT NULL,
-        delete VARCHAR(10) CHECK (delete IN ('True', 'False'))
+        delete BOOLEAN
     );
 
-    CREATE TABLE product_table (
+    CREATE TABLE IF NOT EXISTS product_table (
         product_no INTEGER PRIMARY KEY AUTO_INCREMENT,
+        code VARCHAR(10) UNIQUE,
         category_no INTEGER,
         name VARCHAR(100) NOT NULL,
         company VARCHAR(100),
@@ -59,257 +107,626 @@ def initialize_database(cursor):
         sell_count INTEGER DEFAULT 0,
         quantity INTEGER,
         visit INTEGER DEFAULT 0,
-        seal_service VARCHAR(10) CHECK (seal_service IN ('True', 'False')),
-        delete VARCHAR(10) CHECK (delete IN ('True', 'False')),
+        seal_service BOOLEAN,
+        delete BOOLEAN,
         FOREIGN KEY (category_no) REFERENCES category_table(category_no)
     );
 
-    CREATE TABLE buy_table (
+    CREATE TABLE IF NOT EXISTS buy_table (
         buy_no INTEGER PRIMARY KEY AUTO_INCREMENT,
+        purchase_key VARCHAR(30) UNIQUE,
         member_no INTEGER,
         product_no INTEGER,
-        date VARCHAR(10),
+        date DATE,
         quantity INTEGER,
-        seal_service VARCHAR(10),
+        seal_service BOOLEAN,
         total_price INTEGER,
         method VARCHAR(50),
         FOREIGN KEY (member_no) REFERENCES member_table(member_no),
         FOREIGN KEY (product_no) REFERENCES product_table(product_no)
     );
 
-    CREATE TABLE image_table (
+    CREATE TABLE IF NOT EXISTS image_table (
         image_no INTEGER PRIMARY KEY AUTO_INCREMENT,
         product_no INTEGER,
-        origin_path VARCHAR(255),
+        origin_path VARCHAR(255) UNIQUE,
         save_path VARCHAR(255),
-        save_date VARCHAR(10),
-        update_date VARCHAR(10),
-        delete VARCHAR(10) CHECK (delete IN ('True', 'False')),
+        save_date DATE,
+        update_date DATE,
+        delete BOOLEAN,
         FOREIGN KEY (product_no) REFERENCES product_table(product_no)
     );
 
-    INSERT INTO category_table (category_no, name, delete) VALUES
+    MERGE INTO category_table (category_no, name, delete) KEY (category_no) VALUES
         (1, '미술', 'False'),
         (2, '필통', 'False'),
         (3, '문구류', 'False'),
         (4, '필기류', 'False');
     """
 
-    print("기존 데이터베이스 초기화 중...")
-    cursor.execute("DROP ALL OBJECTS")
+    if reset:
+        print("기존 데이터베이스 초기화 중...")
+        cursor.execute("DROP ALL OBJECTS")
+    version = current_version(cursor)
     for statement in create_sql.strip().split(";"):
         if statement.strip():
             cursor.execute(statement)
+    migrate(cursor, version, product_file)
+    create_manifest_table(cursor)
+    create_rejects_table(cursor)
+    create_summary_tables(cursor)
+    create_image_tables(cursor)
     print("데이터베이스 초기화 및 테이블 생성 완료!")
 
-def load_products(cursor):
+def refresh_product_index(cursor):
+    # DB 에서 상품 코드 -> product_no 매핑을 한 번에 읽어 product_index 를 갱신
+    cursor.execute("SELECT code, product_no FROM product_table WHERE code IS NOT NULL")
+    product_index.clear()
+    product_index.update({str(code): int(str(product_no)) for code, product_no in cursor.fetchall()})
+    return product_index
+
+@metrics.stage("load_products")
+def load_products(cursor, batch_size=BATCH_SIZE, csv_file_path=product_file):
     # 상품 목록 데이터를 H2 데이터베이스에 삽입
 
-    csv_file_path = os.path.join(csv_folder, "상품목록.csv")
     print(f"상품 목록 파일 로드 중: {csv_file_path}")
+    start = time.perf_counter()
     try:
-        df = pd.read_csv(csv_file_path, encoding="utf-8")
-        # 상품 데이터 처리 및 DB 삽입 로직 작성
-
-        # 열 이름 정리 (공백 제거 및 소문자 변환)
-        df.columns = df.columns.str.strip().str.lower()
-
-        # 카테고리 매핑 테이블 (문자열 -> 숫자 변환)
-        category_mapping = {
-            "art": 1,
-            "cases": 2,
-            "stationery": 3,
-            "writing": 4
-        }
-
-        # 카테고리 문자열을 숫자로 변환 (없을 경우 기본값 -1로 설정)
-        df['category_no'] = df['category_no'].map(category_mapping).fillna(-1).astype(int)
-
-        # 빈 값 처리 및 데이터 정리
-        df['in_price'] = df['in_price'].astype(str).str.replace(',', '').astype(int)
-        df['out_price'] = df['out_price'].astype(str).str.replace(',', '').astype(int)
-        df['sell_count'] = df['sell_count'].fillna(0).astype(int)  # 판매량 기본값 0
-        df['quantity'] = df['quantity'].fillna(0).astype(int)  # 재고 기본값 0
-        df['visit'] = df['visit'].fillna(0).astype(int)  # 조회수 기본값 0
-        df['seal_service'] = df['seal_service'].replace({'T': 'True', 'F': 'False'}).fillna('False')  # 각인 여부 기본값 False
-
-        # `delete` 컬럼 추가 (기본값 'False' 설정)
-        if 'delete' not in df.columns:
-            df['delete'] = 'False'
-
-        # `product_no` 열이 존재하면 제거
-        if 'product_no' in df.columns:
-            df = df.drop(columns=['product_no'])
-
-        # 데이터 삽입 SQL 템플릿
-        insert_sql = """
-            INSERT INTO product_table (category_no, name, company, in_price, out_price, sell_count, quantity, visit, seal_service, delete)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-
-        # 데이터프레임에서 각 행 삽입
-        errors = []
-        for _, row in df.iterrows():
-            try:
-                cursor.execute(insert_sql, [
-                    row['category_no'],
-                    row['name'],
-                    row['company'],
-                    row['in_price'],
-                    row['out_price'],
-                    row['sell_count'],
-                    row['quantity'],
-                    row['visit'],
-                    row['seal_service'],
-                    row['delete']
-                ])
-            except Exception as e:
-                errors.append((row['name'], str(e)))
-
-        # 커밋 및 연결 닫기
-        conn.commit()
+        # 열 정의(PRODUCT_SPEC)대로 정리 (CSV 의 `product_no` 는 상품 코드이므로 code 열로 보관)
+        with metrics.timer("pandas_read_csv"):
+            raw = pd.read_csv(csv_file_path, encoding="utf-8")
+        with metrics.timer("clean"):
+            df = apply_spec(raw, PRODUCT_SPEC).assign(delete=False)
+        metrics.count("product_table", csv_file_path, "read", len(df))
+
+        # 상품 코드 기준 MERGE 로 배치 삽입 (이미 있는 상품은 product_no 를 유지한 채 갱신)
+        insert_columns = ['code', 'category_no', 'name', 'company', 'in_price', 'out_price',
+                          'sell_count', 'quantity', 'visit', 'seal_service', 'delete']
+        clear_rejects(cursor, "product_table", csv_file_path)
+        # 없는 카테고리를 가리키는 상품은 삽입 전에 한 번에 거부
+        valid, orphans = split_orphans(df, "product_table", reference_keys(cursor, "product_table"))
+        if orphans:
+            print(f"카테고리가 없는 상품 {len(orphans)}건 제외 (load_rejects 에 기록)")
+            record_rejects(cursor, "product_table", df, orphans, csv_file_path)
+        df = valid
+        inserted, errors = merge_dataframe(cursor, "product_table", insert_columns, "code", df, batch_size)
+        metrics.count("product_table", csv_file_path, "inserted", inserted)
+        mark_changed("product", df['code'])
+
+        if errors:
+            print(f"{len(errors)}개의 데이터 삽입 중 오류 발생:")
+            for idx, error in errors:
+                print(f"상품 이름: {df.at[idx, 'name']}, 오류: {error}")
+            record_rejects(cursor, "product_table", df, errors, csv_file_path)
+
+        # 적재 기록을 데이터와 같은 트랜잭션에 남기고 커밋
+        record_file(cursor, csv_file_path, inserted)
+        commit(cursor)
+        refresh_product_index(cursor)
+        # CSV 값으로 덮어쓴 판매량/재고는 구매 이력 기준으로 다시 계산해야 한다
+        affected_products.update(product_index.values())
+        # 상품 카테고리가 바뀌었을 수 있으므로 판매 요약도 모든 달을 다시 집계한다
+        affected_months.update(purchase_months(cursor))
+        metrics.file_done("product_table", csv_file_path, time.perf_counter() - start)
 
         print("상품 목록 데이터 처리 완료!")
     except Exception as e:
         print(f"상품 목록 처리 중 오류 발생: {e}")
 
-def load_members(cursor):
+# member_table 에 적재하는 회원 정보 열
+member_columns = ['id', 'password', 'name', 'dob', 'gender', 'address', 'email', 'phone', 'joinDate']
+
+def parse_members(file_path):
+    # 회원 목록 CSV 하나를 읽어 member_table 열 이름으로 정리
+    # 열 정의(MEMBER_SPEC)대로 정리 (연도별 헤더 차이, 주민번호 -> 생년월일/성별 포함)
+    with metrics.timer("pandas_read_csv"):
+        raw = pd.read_csv(file_path, encoding="utf-8")
+    with metrics.timer("clean"):
+        return apply_spec(raw, MEMBER_SPEC)[member_columns]
+
+def read_members(file_path):
+    # 정리된 회원 목록 (원본이 그대로면 Arrow 캐시에서 읽는다)
+    print(f"회원 목록 파일 로드 중: {file_path}")
+    return cached_frame(parse_members, file_path)
+
+def changed_members(cursor, df):
+    # DB 에 있는 회원 중 CSV 값과 달라진 행만 반환
+    # (회원 테이블 전체를 열 단위로 한 번에 읽고, 날짜는 CSV 와 같은 YYYY-MM-DD 문자열로 맞춰 비교)
+    current = read_table(cursor, "member_table", member_columns).set_axis(member_columns, axis=1)
+    for column in ('dob', 'joinDate'):
+        current[column] = current[column].dt.strftime("%Y-%m-%d")
+    current = current.set_index('id').reindex(df['id'])
+    new_values = df.set_index('id')[member_columns[1:]].astype(object).fillna('').astype(str)
+    old_values = current[member_columns[1:]].astype(object).fillna('').astype(str)
+    return df[(new_values != old_values).any(axis=1).to_numpy()]
+
+@metrics.stage("load_members")
+def load_members(cursor, batch_size=BATCH_SIZE, server_side=False, csv_files=member_files, keep="first",
+                 workers=1):
     # 회원 데이터를 H2 데이터베이스에 삽입
+    # 각 파일은 누적 스냅샷이므로 모두 읽어 아이디 기준으로 한 번에 중복을 제거한 뒤 적재한다
+    # keep="first": 먼저 등록된 정보 유지 (이미 DB 에 있는 회원은 건너뜀)
+    # keep="last": 가장 나중 스냅샷의 정보로 기존 회원을 갱신 (MERGE ... KEY(id))
+
+    # 파일 파싱은 workers 개의 프로세스에서 병렬로 처리하고, 결과는 파일 순서대로 합친다
+    frames = []
+    for file_path, df, error in parse_all(read_members, csv_files, workers):
+        if error is not None:
+            print(f"회원 목록 처리 중 오류 발생: {error}")
+        else:
+            metrics.count("member_table", file_path, "read", len(df))
+            frames.append(df.assign(source=file_path))
+    if not frames:
+        return
 
-    csv_files = [os.path.join(csv_folder, f"회원목록_{year}년.csv") for year in range(2019, 2024)]
-    for file_path in csv_files:
-        print(f"회원 목록 파일 로드 중: {file_path}")
-        try:
-            df = pd.read_csv(file_path, encoding="utf-8")
-            # 회원 데이터 처리 및 DB 삽입 로직 작성
-
-            # 필요한 열이 없을 경우 기본 값으로 설정
-            required_columns = ['PID', '아이디', '비밀번호', '성함', '주민번호', '주소', '메일 주소', '회원_가입일', '전화번호']
-            for col in required_columns:
-                if col not in df.columns:
-                    df[col] = None
-
-            # 데이터 정리
-            df = df.rename(columns={
-                '아이디': 'id',
-                '비밀번호': 'password',
-                '성함': 'name',
-                '주민번호': 'dob_gender',
-                '주소': 'address',
-                '메일 주소': 'email',
-                '회원_가입일': 'joinDate',
-                '전화번호': 'phone'
-            })
-
-            # 생년월일과 성별 추출
-            df['dob'] = df['dob_gender'].str[:6].apply(
-                lambda x: f"19{x[:2]}-{x[2:4]}-{x[4:6]}" if len(x) >= 6 else None)
-            df['gender'] = df['dob_gender'].str[-1].apply(
-                lambda x: '남' if x in ['1', '3'] else ('여' if x in ['2', '4'] else None))
-
-            # 불필요한 열 제거
-            df = df[['id', 'password', 'name', 'dob', 'gender', 'address', 'email', 'phone', 'joinDate']]
-
-            # 데이터 삽입
-            for _, row in df.iterrows():
-                cursor.execute("SELECT COUNT(*) FROM member_table WHERE id = ?", (row['id'],))
-                if cursor.fetchone()[0] == 0:  # 중복 확인
-                    cursor.execute("""
-                                INSERT INTO member_table (id, password, name, dob, gender, address, email, phone, admin, joinDate, delete)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'N', ?, 'False')
-                            """, (
-                        row['id'], row['password'], row['name'], row['dob'],
-                        row['gender'], row['address'], row['email'], row['phone'], row['joinDate']
-                    ))
-            # 커밋 및 연결 종료
-            conn.commit()
-            print(f"회원 목록 데이터 처리 완료: {file_path}")
-
-        except Exception as e:
-            print(f"회원 목록 처리 중 오류 발생: {e}")
+    try:
+        members = pd.concat(frames, ignore_index=True)
+        df = members.drop_duplicates(subset='id', keep=keep)
+        skipped = len(members) - len(df)
+
+        # 이미 등록된 아이디는 한 번의 조회로 걸러낸다
+        cursor.execute("SELECT id FROM member_table")
+        existing_ids = {str(row[0]) for row in cursor.fetchall()}
+        is_new = ~df['id'].isin(existing_ids)
+        new_members = df[is_new].assign(admin='N', delete=False)
+        existing_members = df[~is_new]
+
+        # 데이터 삽입 (다시 적재하는 파일의 이전 거부 기록은 지운다)
+        for file_path in members['source'].unique():
+            clear_rejects(cursor, "member_table", file_path)
+        insert_columns = ['id', 'password', 'name', 'dob', 'gender', 'address', 'email', 'phone',
+                          'admin', 'joinDate', 'delete']
+        if server_side:
+            # 정리된 데이터를 임시 CSV 로 넘기고 H2 가 CSVREAD 로 직접 읽어 들인다
+            inserted = insert_via_csvread(cursor, "member_table", insert_columns, new_members)
+            errors = []
+        else:
+            inserted, errors = insert_dataframe(cursor, "member_table", insert_columns, new_members, batch_size)
+            for idx, error in errors:
+                print(f"회원 삽입 오류: {error} | 데이터: {new_members.loc[idx].to_dict()}")
+            record_rejects(cursor, "member_table", new_members, errors)
+        failed_counts = new_members.loc[[idx for idx, _ in errors], 'source'].value_counts()
+
+        # 기존 회원 갱신 (값이 바뀐 행만)
+        updated = 0
+        if keep == "last" and len(existing_members):
+            changed = changed_members(cursor, existing_members)
+            updated, errors = merge_dataframe(cursor, "member_table", member_columns, "id", changed, batch_size)
+            for idx, error in errors:
+                print(f"회원 갱신 오류: {error} | 데이터: {changed.loc[idx].to_dict()}")
+            record_rejects(cursor, "member_table", changed, errors)
+            mark_changed("member", changed['id'])
+        mark_changed("member", new_members['id'])
+        skipped += len(existing_members) - updated
+
+        # 파일별 적재 기록을 데이터와 같은 트랜잭션에 남기고 커밋 (신규 회원 수 기준)
+        new_counts = new_members['source'].value_counts()
+        for file_path in members['source'].unique():
+            record_file(cursor, file_path, new_counts.get(file_path, 0))
+            # 회원 파일은 한 번에 합쳐서 적재하므로 파일별 시간 없이 건수만 기록 (rows/s 는 load_members 단계 기록)
+            metrics.count("member_table", file_path, "inserted",
+                          new_counts.get(file_path, 0) - failed_counts.get(file_path, 0))
+            metrics.file_done("member_table", file_path)
+        commit(cursor)
+        print(f"회원 목록 데이터 처리 완료: 신규 {inserted}건, 갱신 {updated}건, 건너뜀 {skipped}건")
 
-def load_purchases(cursor):
+    except Exception as e:
+        print(f"회원 목록 처리 중 오류 발생: {e}")
+
+# buy_table 에 적재하는 구매 이력 열 (purchase_key: 구매_ID 를 정규화한 자연 키, UNIQUE)
+purchase_columns = ['purchase_key', 'member_no', 'product_no', 'date', 'quantity', 'seal_service', 'total_price',
+                    'method']
+
+def purchase_year(file_path):
+    # 연도별 구매 이력 파일 이름의 연도 (구매이력_2019년.csv -> 2019, 없으면 None)
+    match = re.search(r"_(\d{4})년", os.path.basename(file_path))
+    return int(match.group(1)) if match else None
+
+def existing_purchases(cursor, where):
+    # buy_table 에서 where 조건에 맞는 행을 purchase_key 인덱스 DataFrame 으로 반환 (날짜는 YYYY-MM-DD 문자열)
+    current = read_table(cursor, "buy_table", purchase_columns, where).set_axis(purchase_columns, axis=1)
+    current['date'] = current['date'].dt.strftime("%Y-%m-%d")
+    return current.set_index('purchase_key')
+
+def count_purchases(cursor, where):
+    # buy_table 에서 where 조건 (purchase_key 범위) 에 맞는 행 수 (UNIQUE 인덱스 범위 조회)
+    cursor.execute(f"SELECT COUNT(*) FROM buy_table WHERE {where}")
+    return int(str(cursor.fetchone()[0]))
+
+def year_condition(year):
+    # key 는 "YYYY-..." 형식이므로 연도 접두어 범위로 UNIQUE 인덱스를 탄다
+    return f"purchase_key >= '{year}' AND purchase_key < '{year + 1}'"
+
+def mark_affected(df):
+    # 구매 이력 행의 상품과 달을 판매량/재고, 판매 요약 재집계 대상에 추가
+    affected_products.update(int(no) for no in df['product_no'].dropna().unique().tolist())
+    affected_months.update(df['date'].dropna().str[:7].unique().tolist())
+
+def delete_stale_purchases(cursor, file_path, seen_keys, complete=True, fresh=False):
+    # 다시 적재한 연도 파일에서 빠진 구매 이력을 지우고 (지운 행 수, 지우지 않고 남겨 둔 행 수) 를 반환
+    # - 그해 purchase_key 중 이번 파일에 없는 행 (seen_keys 는 거부된 행의 key 도 포함한다)
+    #   (fresh: 적재 전에 그해 key 가 있는 행이 없었으면 방금 넣은 행뿐이므로 다시 읽지 않는다)
+    # - purchase_key 가 생기기 전 (스키마 버전 3 이전) 에 적재되어 key 가 없는 그해 행
+    # 거부된 행이 있으면 (complete 가 아니면) 하나도 지우지 않는다
+    # (구매_ID 를 해석하지 못한 행은 key 가 없어 어느 기존 행을 대신하는지 알 수 없다)
+    year = purchase_year(file_path)
+    if year is None:
+        return 0, 0
+    stale = []
+    if not fresh:
+        current = existing_purchases(cursor, year_condition(year))
+        stale = current[~current.index.isin(seen_keys)]
+        if len(stale) and complete:
+            mark_affected(stale)
+            cursor.executemany("DELETE FROM buy_table WHERE purchase_key = ?", [(key,) for key in stale.index])
+
+    period = (f"{year}-01-01", f"{year + 1}-01-01")
+    if not complete:
+        cursor.execute("SELECT COUNT(*) FROM buy_table WHERE purchase_key IS NULL AND date >= ? AND date < ?", period)
+        return 0, len(stale) + int(str(cursor.fetchone()[0]))
+    cursor.execute("SELECT DISTINCT product_no FROM buy_table "
+                   "WHERE purchase_key IS NULL AND date >= ? AND date < ?", period)
+    legacy_products = [int(str(row[0])) for row in cursor.fetchall() if row[0] is not None]
+    cursor.execute("DELETE FROM buy_table WHERE purchase_key IS NULL AND date >= ? AND date < ?", period)
+    legacy = cursor.rowcount
+    if legacy:
+        affected_products.update(legacy_products)
+        affected_months.update(year_months(year))
+    return len(stale) + legacy, 0
+
+def clean_purchases(df):
+    # 구매 이력 DataFrame (파일 전체 또는 청크) 을 열 정의(PURCHASE_SPEC)대로 buy_table 열 이름과 타입으로 정리
+    with metrics.timer("clean"):
+        return apply_spec(df, PURCHASE_SPEC)
+
+def parse_purchases(file_path):
+    # 구매 이력 CSV 하나를 통째로 읽어 정리
+    with metrics.timer("pandas_read_csv"):
+        raw = pd.read_csv(file_path, encoding="utf-8")
+    return clean_purchases(raw)
+
+def read_purchases(file_path):
+    # 정리된 구매 이력 (원본이 그대로면 Arrow 캐시에서 읽는다)
+    print(f"구매 이력 파일 로드 중: {file_path}")
+    return cached_frame(parse_purchases, file_path)
+
+def upsert_purchases(cursor, df, batch_size=BATCH_SIZE, server_side=False, file_path=None):
+    # 정리된 구매 이력을 purchase_key 기준으로 반영 (실패한 행은 load_rejects 에 기록)
+    # DB 에 같은 key 로 같은 값이 이미 있는 행은 건너뛰고, 새 행과 값이 바뀐 행만 MERGE 한다
+    # key 범위에 기존 행이 하나도 없으면 (--full, 처음 적재하는 해) 비교 없이 모두 INSERT 한다
+    # 반환값: (MERGE 한 행 수, 그대로 둔 행 수, 파일에 있는 purchase_key 배열, 거부/오류 행 수)
+
+    metrics.count("buy_table", file_path, "read", len(df))
+
+    # 상품 코드를 product_index 로 한 번에 product_no 로 변환 (등록되지 않은 코드는 제외)
+    df = df.assign(product_no=df['product_code'].map(product_index))
+    unknown = df['product_no'].isna()
+    # 구매_ID 를 해석할 수 없거나 같은 파일에 두 번 나온 key 는 제외 (중복이면 마지막 행을 쓴다)
+    missing = df['purchase_key'].isna()
+    duplicate = df['purchase_key'].duplicated(keep='last') & ~missing
+    rejected = [(idx, f"등록되지 않은 상품 코드: {df.at[idx, 'product_code']}") for idx in df.index[unknown]]
+    rejected += [(idx, "구매_ID 형식 오류") for idx in df.index[missing & ~unknown]]
+    rejected += [(idx, f"중복된 구매_ID: {df.at[idx, 'purchase_key']}") for idx in df.index[duplicate & ~unknown]]
+    for idx, reason in rejected:
+        print(f"{reason} | 데이터: {df.loc[idx].to_dict()}")
+    record_rejects(cursor, "buy_table", df, rejected, file_path)
+    # 거부된 행의 key 도 파일에 있는 구매 이력이므로 기존 행을 지우지 않도록 함께 돌려준다
+    keys = df.loc[~missing, 'purchase_key'].to_numpy()
+    df = df[~(unknown | missing | duplicate)].astype({'product_no': int})
+
+    # 회원/상품 번호가 DB 에 있는지 키 배열로 한 번에 확인 (FK 오류를 행마다 예외로 겪지 않도록 삽입 전에 거부)
+    valid, orphans = split_orphans(df, "buy_table", purchase_references)
+    if orphans:
+        print(f"참조하는 회원/상품이 없는 구매 이력 {len(orphans)}건 제외 (load_rejects 에 기록)")
+        record_rejects(cursor, "buy_table", df, orphans, file_path)
+    df = valid
+    failed = len(rejected) + len(orphans)
+    if not len(df):
+        return 0, 0, keys, failed
+
+    # 이 청크의 key 범위에 있는 기존 행을 한 번에 읽어 값이 같은 행은 건너뛴다
+    # (key 는 PURCHASE_ID_PATTERN 으로 검증한 숫자와 '-' 뿐이므로 조건에 그대로 넣는다)
+    key_range = f"purchase_key >= '{df['purchase_key'].min()}' AND purchase_key <= '{df['purchase_key'].max()}'"
+    key = None
+    changed = df
+    if count_purchases(cursor, key_range):
+        key = "purchase_key"
+        current = existing_purchases(cursor, key_range)
+        compare_columns = purchase_columns[1:]
+        new_values = df.set_index('purchase_key')[compare_columns].astype(object).fillna('').astype(str)
+        # 문자열로 바꾼 뒤 reindex 해야 정수 열이 실수로 바뀌어 ("5" != "5.0") 달라 보이지 않는다
+        old_values = current[compare_columns].astype(object).fillna('').astype(str).reindex(new_values.index)
+        changed = df[(new_values != old_values).any(axis=1).to_numpy()]
+        # 바뀐 행의 이전 상품/달도 다시 집계
+        mark_affected(current[current.index.isin(changed['purchase_key'])])
+
+    mark_affected(changed)
+    errors = []
+    if server_side:
+        # 정리된 데이터를 임시 CSV 로 넘기고 H2 가 CSVREAD 로 직접 읽어 INSERT (기존 행이 있으면 MERGE) 한다
+        written = insert_via_csvread(cursor, "buy_table", purchase_columns, changed, key=key)
+    elif key:
+        written, errors = merge_dataframe(cursor, "buy_table", purchase_columns, key, changed, batch_size)
+    else:
+        written, errors = insert_dataframe(cursor, "buy_table", purchase_columns, changed, batch_size)
+    for idx, error in errors:
+        print(f"데이터 삽입 오류: {error} | 데이터: {changed.loc[idx].to_dict()}")
+    record_rejects(cursor, "buy_table", changed, errors, file_path)
+    failed += len(errors)
+    metrics.count("buy_table", file_path, "inserted", written)
+    return written, len(df) - len(changed), keys, failed
+
+def purchase_year_is_empty(cursor, file_path):
+    # 연도 파일을 반영하기 전에 그해 key 가 있는 구매 이력이 하나도 없는지
+    year = purchase_year(file_path)
+    return year is not None and not count_purchases(cursor, year_condition(year))
+
+def print_purchase_result(file_path, written, kept, deleted):
+    print(f"구매 이력 반영: {os.path.basename(file_path)} 신규/변경 {written}건, 그대로 {kept}건, 삭제 {deleted}건")
+
+def finish_purchases(cursor, file_path, loaded, failed, left):
+    # 구매 이력 한 파일의 반영을 커밋한다 (다시 적재할 필요가 없을 때만 같은 트랜잭션에 적재 기록을 남긴다)
+    # - 모든 행이 거부/오류로 빠졌으면 기록하지 않는다 (원인을 고친 뒤 다음 실행에서 다시 적재)
+    # - 파일에서 빠진 이전 행을 거부 때문에 지우지 않고 남겨 두었으면 기록하지 않는다 (거부 없이 반영되는 실행에서 지운다)
+    if (failed and not loaded) or left:
+        print(f"구매 이력 {os.path.basename(file_path)}: 거부된 행이 있어 적재 기록을 남기지 않습니다 "
+              f"(거부 {failed}건, 지우지 않은 이전 행 {left}건, 다음 실행에서 다시 적재)")
+    else:
+        record_file(cursor, file_path, loaded)
+    commit(cursor)
+
+def write_purchases(cursor, file_path, df, batch_size=BATCH_SIZE, server_side=False):
+    # 정리된 구매 이력 한 파일 분량을 반영하고 적재 기록과 함께 커밋한다
+    # (파싱은 다른 프로세스/앞 단계에서 끝났으므로 rows/s 는 DB 쓰기 기준)
+    checkpoint()
+    start = time.perf_counter()
+    clear_rejects(cursor, "buy_table", file_path)
+    fresh = purchase_year_is_empty(cursor, file_path)
+    written, kept, keys, failed = upsert_purchases(cursor, df, batch_size, server_side, file_path)
+    deleted, left = delete_stale_purchases(cursor, file_path, keys, complete=not failed, fresh=fresh)
+    finish_purchases(cursor, file_path, written + kept, failed, left)
+    metrics.file_done("buy_table", file_path, time.perf_counter() - start)
+    print_purchase_result(file_path, written, kept, deleted)
+
+def stream_purchases(cursor, file_path, chunksize, batch_size=BATCH_SIZE, server_side=False):
+    # 파일을 chunksize 행씩 읽어 정리/반영한 뒤 바로 버린다
+    # (최대 메모리가 파일 크기가 아니라 chunksize 에 비례한다, 파일에서 빠진 행을 찾기 위한 key 목록만 남긴다)
+    print(f"구매 이력 파일 스트리밍 적재 중: {file_path}")
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+
+    clear_rejects(cursor, "buy_table", file_path)
+    fresh = purchase_year_is_empty(cursor, file_path)
+    written = kept = failed = 0
+    seen_keys = []
+    for number, chunk in enumerate(pd.read_csv(file_path, encoding="utf-8", chunksize=chunksize), 1):
+        checkpoint()
+        chunk_written, chunk_kept, keys, chunk_failed = upsert_purchases(cursor, clean_purchases(chunk), batch_size,
+                                                                         server_side, file_path)
+        written += chunk_written
+        kept += chunk_kept
+        failed += chunk_failed
+        seen_keys.append(keys)
+        # 청크마다 진행 이벤트 (파일에는 남기지 않는다)
+        metrics.notify("chunk", table="buy_table", file=os.path.basename(file_path), chunk=number,
+                       rows=len(chunk), inserted=chunk_written, total_inserted=written)
+    deleted, left = delete_stale_purchases(cursor, file_path, np.concatenate(seen_keys) if seen_keys else [],
+                                           complete=not failed, fresh=fresh)
+    finish_purchases(cursor, file_path, written + kept, failed, left)
+
+    elapsed = time.perf_counter() - start
+    metrics.file_done("buy_table", file_path, elapsed)
+    peak = tracemalloc.get_traced_memory()[1]
+    if not tracing:
+        tracemalloc.stop()
+    print_purchase_result(file_path, written, kept, deleted)
+    print(f"구매 이력 적재 완료: {os.path.basename(file_path)} {written + kept}건, "
+          f"{(written + kept) / elapsed:.0f} rows/s, 최대 메모리 {peak / 2 ** 20:.1f}MB")
+
+@metrics.stage("load_purchases")
+def load_purchases(cursor, batch_size=BATCH_SIZE, server_side=False, csv_files=purchase_files, workers=1,
+                   chunksize=None):
     # 구매 데이터를 H2 데이터베이스에 삽입
+    # chunksize 가 있으면 파일마다 청크 단위로 스트리밍 적재하고 (workers 는 사용하지 않음)
+    # 없으면 파일 파싱/정리는 workers 개의 프로세스에서 병렬로, DB 쓰기는 하나의 쓰기 스레드에서 처리한다
+    refresh_product_index(cursor)
+    purchase_references.clear()
+    purchase_references.update(reference_keys(cursor, "buy_table"))
+    if chunksize:
+        for file_path in csv_files:
+            try:
+                stream_purchases(cursor, file_path, chunksize, batch_size, server_side)
+            except Exception as e:
+                print(f"파일 처리 중 오류 발생: {file_path}, 오류 메시지: {e}")
+        return
 
-    csv_files = [os.path.join(csv_folder, f"구매이력_{year}년.csv") for year in range(2019, 2024)]
-    for file_path in csv_files:
-        print(f"구매 이력 파일 로드 중: {file_path}")
+    def write(file_path, df, error):
+        if error is not None:
+            print(f"파일 처리 중 오류 발생: {file_path}, 오류 메시지: {error}")
+            return
         try:
-            df = pd.read_csv(file_path, encoding="utf-8")
-            # 구매 데이터 처리 및 DB 삽입 로직 작성
-
-            # 모든 열 이름의 공백 제거
-            df.columns = df.columns.str.strip()
-
-            # 열 이름 변경 및 데이터 정리
-            df = df.rename(columns={
-                '구매_ID': 'buy_no',
-                '구매_날짜': 'date',
-                '구매자_ID': 'member_no',
-                '상품_ID': 'product_no',
-                '구매_수량': 'quantity',
-                '각인_서비스': 'seal_service',
-                '결제_방식': 'method',
-                '총_결제_금액': 'total_price'
-            })
-
-            # 데이터 타입 변환
-            df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce').fillna(0).astype(int)
-            df['total_price'] = df['total_price'].str.replace(',', '', regex=True).fillna('0').astype(int)
-            df['product_no'] = df['product_no'].str.extract(r'(\d+)').fillna(0).astype(int)
-
-            # 데이터 삽입
-            for _, row in df.iterrows():
-                try:
-                    cursor.execute("""
-                                INSERT INTO buy_table (member_no, product_no, date, quantity, seal_service, total_price, method)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                        row['member_no'],
-                        row['product_no'],
-                        row['date'],
-                        row['quantity'],
-                        row['seal_service'],
-                        row['total_price'],
-                        row['method']
-                    ))
-                except Exception as e:
-                    print(f"데이터 삽입 오류: {e} | 데이터: {row.to_dict()}")
-            conn.commit()
-
+            write_purchases(cursor, file_path, df, batch_size, server_side)
         except Exception as e:
             print(f"파일 처리 중 오류 발생: {file_path}, 오류 메시지: {e}")
 
-if __name__ == "__main__":
-    try:
-        # JVM 시작
-        if not jpype.isJVMStarted():
-            jpype.startJVM(classpath=[h2_jar_path])
-
-        # H2 데이터베이스 연결
-        conn = jaydebeapi.connect("org.h2.Driver", db_url, [username, password], h2_jar_path)
-        cursor = conn.cursor()
-
+    run_with_writer(parse_files(read_purchases, csv_files, workers), write)
+
+def refresh_product_counters(cursor, product_nos=None):
+    # 구매 이력을 상품별로 한 번에 집계해 판매량(sell_count)과 남은 재고(quantity)를 갱신
+    # quantity 는 "입고 재고 - 판매량" 이므로 기존 판매량을 되돌린 뒤 새 판매량을 뺀다
+    # product_nos 가 있으면 해당 상품만 다시 집계한다 (None 이면 전체)
+    if product_nos is not None and not product_nos:
+        return 0
+    condition = ""
+    if product_nos is not None:
+        condition = f"WHERE p2.product_no IN ({', '.join(str(int(no)) for no in sorted(product_nos))})"
+    cursor.execute(f"""
+        MERGE INTO product_table p
+        USING (
+            SELECT p2.product_no, COALESCE(SUM(b.quantity), 0) AS sold
+            FROM product_table p2 LEFT JOIN buy_table b ON b.product_no = p2.product_no
+            {condition}
+            GROUP BY p2.product_no
+        ) s
+        ON p.product_no = s.product_no
+        WHEN MATCHED THEN UPDATE SET quantity = p.quantity + p.sell_count - s.sold, sell_count = s.sold
+    """)
+    updated = cursor.rowcount
+    commit(cursor)
+    print(f"상품 판매량/재고 갱신 완료: {updated}개 상품")
+    return updated
+
+def refresh_sales_summary(cursor):
+    # 구매 이력이 바뀐 달만 판매 요약 (sales_summary, member_sales_summary) 을 다시 집계
+    months = refresh_summary(cursor, affected_months)
+    commit(cursor)
+    if months is None:
+        print("판매 요약 전체 재집계 완료")
+    else:
+        print(f"판매 요약 갱신 완료: {months}개월")
+    return months
+
+def parse_args(argv=None):
+    # 실행 옵션 (EXE 를 인자 없이 실행하면 기본값으로 동작)
+    parser = argparse.ArgumentParser(description="CSV 데이터를 H2 데이터베이스에 적재")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"executeBatch 한 번에 보낼 행 수 (기본값 {BATCH_SIZE})")
+    parser.add_argument("--commit-every", type=int, default=bulk_insert.COMMIT_EVERY,
+                        help=f"N 행마다 중간 커밋 (기본값 {bulk_insert.COMMIT_EVERY}, 0 이면 파일 단위로만 커밋)")
+    parser.add_argument("--server-load", action="store_true",
+                        help="회원/구매 데이터를 H2 CSVREAD 로 서버에서 직접 적재")
+    parser.add_argument("--member-keep", choices=["first", "last"], default="first",
+                        help="중복 회원 처리: first 는 먼저 등록된 정보 유지, last 는 최신 스냅샷으로 갱신")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="CSV 파싱에 사용할 프로세스 수 (기본값 1: 순차 처리)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="구매 이력을 N 행 단위로 스트리밍 적재 (파일별 rows/s 와 최대 메모리 출력)")
+    parser.add_argument("--db", default=db_url,
+                        help=f"접속할 H2 DB: {', '.join(DB_TARGETS)} 또는 JDBC URL (기본값 {db_url})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="정리된 CSV 의 Arrow 캐시를 쓰지 않고 매번 CSV 를 다시 읽기")
+    parser.add_argument("--full", action="store_true",
+                        help="DROP ALL OBJECTS 후 모든 CSV 를 다시 적재 (기본은 바뀐 파일만 적재)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="모듈별 import 시간과 JVM 시작 시간을 끝에 출력")
+    parser.add_argument("--metrics", metavar="PATH", default=None,
+                        help="단계별 시간과 파일별 처리량을 JSON Lines 로 기록할 파일 (- 이면 화면에 출력)")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile/tracemalloc 으로 전체 실행을 측정해 상위 구간을 출력")
+    parser.add_argument("--restore", action="store_true",
+                        help="입력 CSV 와 같은 입력으로 만든 스냅샷이 있으면 CSV 대신 스냅샷에서 DB 를 복원")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="적재가 끝난 DB 를 입력 CSV 해시 이름의 압축 스냅샷으로 저장 (입력이 그대로면 건너뜀)")
+    parser.add_argument("--images", metavar="DIR", default=None,
+                        help="상품 이미지 폴더를 image_table 로 적재 (새로 생기거나 바뀐 이미지만, 저장 위치는 IMAGE_STORE_DIR)")
+    return parser.parse_args(argv)
+
+def run_incremental(cursor, args):
+    # 적재 기록(load_manifest)과 비교해 새로 생기거나 바뀐 파일만 적재
+    if pending_files(cursor, [product_file]):
+        # 상품 코드 기준 MERGE 이므로 기존 product_no (구매 이력이 참조하는 키) 는 유지된다
+        load_products(cursor, args.batch_size)
+
+    changed_members = pending_files(cursor, member_files)
+    changed_purchases = pending_files(cursor, purchase_files)
+    print(f"변경된 파일: 회원 {len(changed_members)}개, 구매 이력 {len(changed_purchases)}개")
+    if changed_members:
+        load_members(cursor, args.batch_size, args.server_load, changed_members, args.member_keep, args.workers)
+    if changed_purchases:
+        # buy_table 이 비어 있을 때만 보조 인덱스를 지우고 적재가 끝난 뒤 한 번에 만든다
+        # (기존 이력이 있으면 MERGE/DELETE 도 인덱스를 쓰고, 다시 만들면 전체 이력을 다시 읽어야 한다)
+        if not count_purchases(cursor, "TRUE"):
+            drop_indexes(cursor)
+        load_purchases(cursor, args.batch_size, args.server_load, changed_purchases, args.workers, args.chunksize)
+
+def run_load(args):
+    # 옵션대로 전체 적재를 실행하고 실행 요약 기록을 반환 (명령행 실행과 async_loader.load_all 이 함께 쓴다)
+    # 오류나 취소 (LoadCancelled) 로 끝나면 마지막 커밋 이후의 변경은 롤백되고 예외는 호출한 쪽으로 전달된다
+    # JVM 과 연결 풀은 닫지 않는다 (한 프로세스에서 여러 번 적재할 수 있도록, 끝낼 때 shutdown() 호출)
+    bulk_insert.COMMIT_EVERY = args.commit_every
+    if args.no_cache:
+        # 작업 프로세스에도 전달되도록 환경 변수로 끈다
+        os.environ[CACHE_ENABLED_ENV] = "0"
+
+    # H2 연결 정보 설정 (JVM 과 연결은 처음 필요할 때 한 번만 만든다)
+    configure(h2_jar_path, resolve_url(args.db), username, password)
+    metrics.configure(args.metrics)
+    metrics.reset()
+    affected_products.clear()
+    affected_months.clear()
+
+    # 블록이 정상 종료되면 커밋, 오류가 나면 롤백 (--profile 이면 전체를 프로파일링)
+    with metrics.profiled(args.profile), transaction() as cursor:
+        mark("DB 준비 완료")
+        # 스냅샷에서 복원했으면 DB 가 입력 CSV 와 같으므로 이어지는 증분 적재는 할 일이 없다
+        restored = args.restore and restore_snapshot(cursor, input_files)
         # 작업 호출 (순서에 따라)
-        initialize_database(cursor)
-        load_products(cursor)
-        load_members(cursor)
-        load_purchases(cursor)
+        initialize_database(cursor, reset=args.full and not restored)
+        if args.full or restored:
+            # DB 를 통째로 바꿨으므로 검색 색인은 다음 검색에서 처음부터 다시 만든다
+            clear_indexes()
+        if args.full and not restored:
+            load_products(cursor, args.batch_size)
+            checkpoint()
+            load_members(cursor, args.batch_size, args.server_load, keep=args.member_keep,
+                         workers=args.workers)
+            checkpoint()
+            load_purchases(cursor, args.batch_size, args.server_load, workers=args.workers,
+                           chunksize=args.chunksize)
+        else:
+            run_incremental(cursor, args)
+        checkpoint()
+
+        # 상품 이미지 적재 (상품 코드 -> product_no 는 방금 적재한 상품 목록 기준)
+        if args.images:
+            load_images(cursor, args.images, refresh_product_index(cursor), args.batch_size, args.workers)
+            checkpoint()
+
+        # 대량 적재가 끝난 뒤 buy_table 보조 인덱스 생성 (증분 적재로 이미 있으면 건너뜀)
+        with metrics.stage("create_indexes"):
+            create_indexes(cursor)
+        print("인덱스 생성 완료!")
+
+        # 이번에 바뀐 상품만 판매량/재고 다시 집계
+        with metrics.stage("refresh_product_counters"):
+            refresh_product_counters(cursor, affected_products)
+
+        # 이번에 바뀐 달만 판매 요약 다시 집계
+        with metrics.stage("refresh_sales_summary"):
+            refresh_sales_summary(cursor)
+
+        # 커밋한 뒤 이번에 바뀐 상품/회원만 검색 색인에 반영 (이 프로세스에서 이미 만든 색인만)
+        # (커밋 전에 반영하면 뒤에서 롤백된 변경이 색인에 남는다)
+        commit(cursor)
+        with metrics.stage("refresh_search_index"):
+            refresh_indexes(cursor)
+
+        # 커밋한 상태를 스냅샷으로 저장
+        if args.snapshot:
+            with metrics.stage("snapshot"):
+                save_snapshot(cursor, input_files)
+    result = metrics.summary()
+    mark("모든 작업 완료")
+    print("모든 작업이 완료되었습니다!")
+    return result
 
-        # 작업 완료 후 커밋
-        conn.commit()
-        print("모든 작업이 완료되었습니다!")
+if __name__ == "__main__":
+    # PyInstaller EXE 에서 프로세스 풀을 쓰기 위해 필요
+    multiprocessing.freeze_support()
+    args = parse_args()
+    try:
+        run_load(args)
 
     except Exception as e:
         print(f"오류 발생: {e}")
 
     finally:
-        # 리소스 정리
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-        if jpype.isJVMStarted():
-            jpype.shutdownJVM()
+        # 리소스 정리 (풀의 연결과 JVM 종료)
+        shutdown()
+        if args.startup_report:
+            print_report()
         # 종료 전 대기
         input("프로그램이 종료되었습니다. Enter 키를 눌러 창을 닫으세요.")
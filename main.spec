@@ -1,4 +1,6 @@
 # -*- mode: python ; coding: utf-8 -*-
+# 배포용 단일 EXE 빌드 (시작 시간이 중요하면 main_fast.spec 의 onedir 빌드를 사용)
+# pandas/numpy/jpype/pyarrow/PIL 은 startup.lazy_import 로 이름만으로 불러오므로 hiddenimports 에 넣는다
 
 
 a = Analysis(
@@ -6,7 +8,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('csv', 'csv'), ('jar', 'jar')],
-    hiddenimports=['jpype', 'jpype._core', 'jpype._jvm', 'jpype._ref', '_jpype'],
+    hiddenimports=['jpype', 'jpype._core', 'jpype._jvm', 'jpype._ref', '_jpype', 'jaydebeapi',
+                   'numpy', 'pandas', 'pyarrow', 'PIL.Image'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,52 @@
+# -*- mode: python ; coding: utf-8 -*-
+# 시작 시간 우선 빌드 (pyinstaller main_fast.spec -> dist/main_fast/main.exe)
+# - onedir: 실행할 때마다 임시 폴더에 압축을 푸는 onefile 과 달리 바로 실행된다
+# - upx=False: DLL/pyd 압축 해제 시간이 없다 (대신 폴더 크기가 커진다)
+# - 적재에 쓰지 않는 무거운 패키지는 제외한다
+# pandas/numpy/jpype/pyarrow/PIL 은 startup.lazy_import 로 이름만으로 불러오므로 hiddenimports 에 넣는다
+
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('csv', 'csv'), ('jar', 'jar')],
+    hiddenimports=['jpype', 'jpype._core', 'jpype._jvm', 'jpype._ref', '_jpype', 'jaydebeapi',
+                   'numpy', 'pandas', 'pyarrow', 'PIL.Image'],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=['tkinter', 'matplotlib', 'IPython', 'jupyter', 'notebook', 'scipy', 'pytest',
+              'sqlalchemy', 'openpyxl', 'xlrd', 'lxml', 'bs4', 'html5lib', 'jinja2', 'tables',
+              'numexpr', 'bottleneck', 'fsspec', 'pandas.tests', 'numpy.tests', 'pyarrow.tests'],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='main',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='main_fast',
+)
@@ -0,0 +1,212 @@
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import contextlib
+import tracemalloc
+
+# 적재 단계별 시간과 파일별 처리량 계측
+# - stage(name): 단계 (initialize_database, load_products, ...) 실행 시간과 rows/s
+# - timer(name): 세부 구간 누적 시간 (CSV 읽기, 정리, JDBC 배치, 커밋 ...)
+#   단계 기록에는 그 단계 동안 늘어난 세부 구간 시간이 함께 들어간다
+# - count(table, file_path, field, n) / file_done(...): 파일별 읽은 행, 삽입, 거부 건수와 rows/s
+# 기록은 JSON Lines 로 내보낸다 (--metrics 파일, "-" 이면 표준 출력, 지정하지 않으면 내보내지 않음)
+# listeners 에 등록한 함수는 기록마다 dict 로 호출된다 (async_loader 의 진행 이벤트)
+# 프로세스 풀의 작업 프로세스에서 잰 시간 (workers > 1 일 때의 CSV 읽기/정리) 은 집계되지 않는다
+
+# 세부 구간 이름 -> 누적 시간(초), 호출 횟수 (jdbc_batch/jdbc_row/commit 은 JDBC 호출 수가 된다)
+timers = {}
+calls = {}
+
+# (테이블, 파일 이름) -> {"read": n, "inserted": n, "rejected": n}
+counters = {}
+
+settings = {
+    "path": None,
+}
+
+# 기록 dict 를 받는 함수 목록 (기록한 스레드에서 호출되므로 오래 걸리는 일을 하면 안 된다)
+listeners = []
+
+_lock = threading.Lock()
+_started = time.perf_counter()
+
+# --profile 실행 중일 때 스레드별 cProfile (첫 번째가 메인 스레드)
+_profilers = []
+
+
+def configure(path=None):
+    # JSON Lines 출력 대상 설정 (None 이면 기록만 하고 내보내지 않는다)
+    settings["path"] = path
+
+
+def reset():
+    # 새 실행을 시작하기 전에 누적 시간과 파일별 건수를 비운다 (한 프로세스에서 여러 번 적재할 때)
+    global _started
+    with _lock:
+        timers.clear()
+        calls.clear()
+        counters.clear()
+        _started = time.perf_counter()
+
+
+def notify(event, **fields):
+    # listeners 에만 알리고 기록 dict 를 반환 (배치마다 나오는 진행 이벤트처럼 파일에 남기지 않을 기록)
+    record = {"event": event, "time": round(time.time(), 3), **fields}
+    for listener in list(listeners):
+        listener(record)
+    return record
+
+
+def emit(event, **fields):
+    # 기록 한 줄을 JSON 으로 내보내고 listeners 에도 알린다
+    record = notify(event, **fields)
+    path = settings["path"]
+    if not path:
+        return record
+    line = json.dumps(record, ensure_ascii=False)
+    with _lock:
+        if path == "-":
+            print(line)
+        else:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    return record
+
+
+def add_time(name, seconds):
+    with _lock:
+        timers[name] = timers.get(name, 0.0) + seconds
+        calls[name] = calls.get(name, 0) + 1
+
+
+@contextlib.contextmanager
+def timer(name):
+    # 블록 실행 시간을 세부 구간 name 에 더한다
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(name, time.perf_counter() - start)
+
+
+def _rounded(values):
+    return {name: round(seconds, 4) for name, seconds in values.items()}
+
+
+def rows_read():
+    # 지금까지 읽은 전체 행 수
+    return sum(entry["read"] for entry in counters.values())
+
+
+@contextlib.contextmanager
+def stage(name):
+    # 단계 실행 시간, 그동안의 세부 구간 시간, 읽은 행 수와 rows/s 를 기록
+    # (함수 데코레이터로도 쓸 수 있다: @stage("load_products"))
+    with _lock:
+        before = dict(timers)
+        rows_before = rows_read()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        with _lock:
+            spent = {key: value - before.get(key, 0.0) for key, value in timers.items()
+                     if value - before.get(key, 0.0) > 0}
+            rows = rows_read() - rows_before
+        emit("stage", stage=name, seconds=round(seconds, 4), rows=rows,
+             rows_per_s=round(rows / seconds, 1) if rows and seconds > 0 else None, timers=_rounded(spent))
+
+
+def _file_key(table, file_path):
+    return table, os.path.basename(file_path) if file_path else None
+
+
+def count(table, file_path, field, n):
+    # 파일별 건수 누적 (field: read, inserted, rejected)
+    key = _file_key(table, file_path)
+    with _lock:
+        entry = counters.setdefault(key, {"read": 0, "inserted": 0, "rejected": 0})
+        entry[field] += int(n)
+
+
+def file_done(table, file_path, seconds=None):
+    # 파일 하나의 처리 결과를 기록 (seconds 가 없으면 rows/s 없이 건수만 기록)
+    key = _file_key(table, file_path)
+    with _lock:
+        entry = dict(counters.get(key, {"read": 0, "inserted": 0, "rejected": 0}))
+    emit("file", table=table, file=key[1], **entry,
+         seconds=round(seconds, 4) if seconds is not None else None,
+         rows_per_s=round(entry["read"] / seconds, 1) if seconds else None)
+
+
+def summary():
+    # 실행 전체 요약 기록 (기록 dict 를 반환)
+    return emit("run", seconds=round(time.perf_counter() - _started, 4), timers=_rounded(timers), calls=dict(calls))
+
+
+@contextlib.contextmanager
+def thread_profile():
+    # --profile 실행 중이면 현재 스레드도 프로파일링 (cProfile 은 시작한 스레드만 측정한다)
+    if not _profilers:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with _lock:
+            _profilers.append(profiler)
+
+
+@contextlib.contextmanager
+def profiled(enabled=True, top=20):
+    # 블록 전체를 cProfile/tracemalloc 으로 측정하고 끝나면 상위 구간을 출력
+    if not enabled:
+        yield
+        return
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    _profilers.append(profiler)
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if not tracing:
+            tracemalloc.stop()
+        print_hotspots(snapshot, peak, top)
+        _profilers.clear()
+
+
+def print_hotspots(snapshot, peak, top=20):
+    # 자체 실행 시간 상위 함수와 메모리를 가장 많이 잡고 있는 코드 줄을 출력하고 기록
+    output = io.StringIO()
+    stats = pstats.Stats(*_profilers, stream=output)
+    stats.sort_stats("tottime").print_stats(top)
+    print(f"실행 시간 상위 {top}개 함수 (하위 호출을 뺀 자체 시간 기준):")
+    print(output.getvalue())
+
+    for (filename, line, function), (_, calls, own, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]:
+        emit("hotspot", kind="cpu", function=f"{os.path.basename(filename)}:{line}({function})",
+             calls=calls, seconds=round(own, 4), cumulative_seconds=round(cumulative, 4))
+
+    print(f"메모리 사용 상위 {top}개 위치 (최대 {peak / 2 ** 20:.1f}MB):")
+    for entry in snapshot.statistics("lineno")[:top]:
+        frame = entry.traceback[0]
+        print(f"  {os.path.basename(frame.filename)}:{frame.lineno}  {entry.size / 2 ** 10:.1f}KB  ({entry.count}개)")
+        emit("hotspot", kind="memory", location=f"{os.path.basename(frame.filename)}:{frame.lineno}",
+             bytes=entry.size, blocks=entry.count)
+    sys.stdout.flush()
@@ -0,0 +1,81 @@
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cancellation import checkpoint
+from metrics import thread_profile
+
+
+def parse_files(read_func, file_paths, workers=1):
+    # 파일마다 read_func(file_path) 를 실행해 (파일 경로, DataFrame, 오류) 를 순서대로 내보낸다
+    # workers > 1 이면 프로세스 풀에서 병렬로 파싱하고 끝난 순서대로 내보낸다
+    # (read_func 는 다른 프로세스에서 불러올 수 있도록 모듈 최상위 함수여야 한다)
+    if workers <= 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            checkpoint()
+            try:
+                yield file_path, read_func(file_path), None
+            except Exception as e:
+                yield file_path, None, e
+        return
+
+    # JVM 이 떠 있는 프로세스를 fork 하면 멈출 수 있으므로 항상 spawn 으로 작업 프로세스를 만든다
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(file_paths)), mp_context=context) as pool:
+        futures = {pool.submit(read_func, file_path): file_path for file_path in file_paths}
+        try:
+            for future in as_completed(futures):
+                checkpoint()
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+        finally:
+            # 취소되었거나 소비자가 중간에 멈추면 아직 시작하지 않은 파싱은 버린다
+            for future in futures:
+                future.cancel()
+
+
+def parse_all(read_func, file_paths, workers=1):
+    # parse_files 결과를 원래 파일 순서로 정렬해 리스트로 반환
+    order = {file_path: i for i, file_path in enumerate(file_paths)}
+    return sorted(parse_files(read_func, file_paths, workers), key=lambda item: order[item[0]])
+
+
+def run_with_writer(items, write_func, max_pending=2):
+    # items 에서 나오는 (파일 경로, DataFrame, 오류) 를 하나의 DB 쓰기 스레드로 넘긴다
+    # 파싱(생산자)과 DB 쓰기(소비자)가 겹쳐서 진행되고, DB 연결은 쓰기 스레드만 사용한다
+    # 쓰기 스레드에서 취소 (LoadCancelled) 가 나면 남은 항목은 쓰지 않고 호출한 스레드에서 다시 발생시킨다
+    pending = queue.Queue(maxsize=max_pending)
+    failures = []
+    aborted = []
+
+    def writer():
+        with thread_profile():
+            while True:
+                item = pending.get()
+                if item is None:
+                    break
+                if aborted:
+                    continue
+                try:
+                    write_func(*item)
+                except Exception as e:
+                    failures.append((item[0], e))
+                except BaseException as e:
+                    aborted.append(e)
+
+    thread = threading.Thread(target=writer, name="db-writer", daemon=True)
+    thread.start()
+    try:
+        for item in items:
+            if aborted:
+                break
+            pending.put(item)
+    finally:
+        pending.put(None)
+        thread.join()
+    if aborted:
+        raise aborted[0]
+    return failures
@@ -0,0 +1,52 @@
+import os
+import json
+from collections import Counter
+
+import metrics
+
+# 적재하지 못한 행과 그 이유를 남기는 테이블
+# (print 로 보여 주는 오류와 같은 내용을 나중에 조회/재처리할 수 있게 보관)
+REJECTS_SQL = """
+CREATE TABLE IF NOT EXISTS load_rejects (
+    reject_no INTEGER PRIMARY KEY AUTO_INCREMENT,
+    table_name VARCHAR(50) NOT NULL,
+    source VARCHAR(255),
+    row_data VARCHAR(4000),
+    reason VARCHAR(1000),
+    rejected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+INSERT_SQL = "INSERT INTO load_rejects (table_name, source, row_data, reason) VALUES (?, ?, ?, ?)"
+
+
+def create_rejects_table(cursor):
+    cursor.execute(REJECTS_SQL)
+
+
+def clear_rejects(cursor, table, file_path):
+    # 파일을 다시 적재하기 전에 그 파일에서 나온 이전 거부 기록을 지운다
+    cursor.execute("DELETE FROM load_rejects WHERE table_name = ? AND source = ?",
+                   (table, os.path.basename(file_path)))
+
+
+def record_rejects(cursor, table, df, errors, file_path=None):
+    # errors 의 (행 인덱스, 이유) 를 원본 행 내용과 함께 한 번에 기록
+    # file_path 가 없으면 df 의 source 열 (행별 원본 파일) 을 사용한다
+    if not errors:
+        return 0
+    # 거부된 행을 한 번에 꺼내 dict 목록으로 변환 (행마다 df.loc 로 꺼내지 않는다)
+    values = df.loc[[idx for idx, _ in errors]].astype(object)
+    records = values.where(values.notna(), None).to_dict("records")
+    rows = []
+    sources = Counter()
+    for row, (_, reason) in zip(records, errors):
+        source = file_path or row.get("source")
+        sources[source] += 1
+        # 이유는 JDBC 예외의 첫 줄 (스택 트레이스 제외) 만 보관
+        rows.append((table, os.path.basename(source) if source else None,
+                     json.dumps(row, ensure_ascii=False, default=str)[:4000], str(reason).splitlines()[0][:1000]))
+    for source, n in sources.items():
+        metrics.count(table, source, "rejected", n)
+    cursor.executemany(INSERT_SQL, rows)
+    return len(rows)
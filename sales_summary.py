@@ -0,0 +1,170 @@
+from startup import lazy_import
+
+pd = lazy_import("pandas")
+
+# 적재 후 미리 집계해 두는 판매 요약 테이블
+# - sales_summary: 월 x 카테고리 x 상품 x 결제 방식별 판매 수량, 매출, 주문 수, 각인 서비스 주문 수
+# - member_sales_summary: 월 x 회원별 판매 수량, 매출, 주문 수 (연도별 상위 회원 조회용)
+# 구매 이력이 바뀐 달만 지우고 다시 집계하므로, 리포트는 buy_table 전체를 훑지 않고 요약 테이블만 읽는다
+# sale_month 는 'YYYY-MM' 문자열 (MONTH 는 H2 예약어)
+SUMMARY_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS sales_summary (
+        sale_month CHAR(7) NOT NULL,
+        category_no INTEGER NOT NULL,
+        product_no INTEGER NOT NULL,
+        method VARCHAR(50) NOT NULL,
+        quantity BIGINT NOT NULL,
+        revenue BIGINT NOT NULL,
+        orders INTEGER NOT NULL,
+        sealed_orders INTEGER NOT NULL,
+        PRIMARY KEY (sale_month, category_no, product_no, method)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS member_sales_summary (
+        sale_month CHAR(7) NOT NULL,
+        member_no INTEGER NOT NULL,
+        quantity BIGINT NOT NULL,
+        revenue BIGINT NOT NULL,
+        orders INTEGER NOT NULL,
+        PRIMARY KEY (sale_month, member_no)
+    )
+    """,
+]
+
+MONTH_SQL = "FORMATDATETIME(b.date, 'yyyy-MM')"
+
+# 달 하나 (또는 WHERE 조건이 없으면 전체) 를 다시 집계하는 INSERT ... SELECT
+SALES_INSERT_SQL = f"""
+INSERT INTO sales_summary (sale_month, category_no, product_no, method, quantity, revenue, orders, sealed_orders)
+SELECT {MONTH_SQL}, COALESCE(p.category_no, -1), b.product_no, COALESCE(b.method, ''),
+       COALESCE(SUM(b.quantity), 0), COALESCE(SUM(b.total_price), 0), COUNT(*),
+       SUM(CASE WHEN b.seal_service THEN 1 ELSE 0 END)
+FROM buy_table b JOIN product_table p ON p.product_no = b.product_no
+WHERE b.date IS NOT NULL {{condition}}
+GROUP BY {MONTH_SQL}, COALESCE(p.category_no, -1), b.product_no, COALESCE(b.method, '')
+"""
+
+MEMBER_INSERT_SQL = f"""
+INSERT INTO member_sales_summary (sale_month, member_no, quantity, revenue, orders)
+SELECT {MONTH_SQL}, b.member_no, COALESCE(SUM(b.quantity), 0), COALESCE(SUM(b.total_price), 0), COUNT(*)
+FROM buy_table b
+WHERE b.date IS NOT NULL AND b.member_no IS NOT NULL {{condition}}
+GROUP BY {MONTH_SQL}, b.member_no
+"""
+
+# query_sales 에서 묶을 수 있는 열 -> SQL 식
+DIMENSIONS = {
+    "month": "sale_month",
+    "year": "SUBSTRING(sale_month, 1, 4)",
+    "category_no": "category_no",
+    "product_no": "product_no",
+    "method": "method",
+}
+MEASURES = ["quantity", "revenue", "orders", "sealed_orders"]
+
+
+def create_summary_tables(cursor):
+    for sql in SUMMARY_SQL:
+        cursor.execute(sql)
+
+
+def month_range(month):
+    # 'YYYY-MM' -> 그달 첫날, 다음 달 첫날 (buy_table 날짜 인덱스를 쓰는 범위 조건용)
+    year, number = int(month[:4]), int(month[5:7])
+    next_year, next_number = (year + 1, 1) if number == 12 else (year, number + 1)
+    return f"{year:04d}-{number:02d}-01", f"{next_year:04d}-{next_number:02d}-01"
+
+
+def year_months(year):
+    return {f"{year:04d}-{number:02d}" for number in range(1, 13)}
+
+
+def purchase_months(cursor):
+    # buy_table 에 구매 이력이 있는 모든 달
+    cursor.execute(f"SELECT DISTINCT {MONTH_SQL} FROM buy_table b WHERE b.date IS NOT NULL")
+    return {str(row[0]) for row in cursor.fetchall()}
+
+
+def refresh_summary(cursor, months=None):
+    # months 의 요약만 지우고 다시 집계 (None 이면 전체를 다시 만든다)
+    # 요약 테이블이 비어 있으면 (처음 만들었거나 이전 버전 DB) 전체를 만든다
+    # 반환값: 다시 집계한 달 수 (전체면 None)
+    if months is not None and not months:
+        return 0
+    cursor.execute("SELECT COUNT(*) FROM sales_summary")
+    if int(str(cursor.fetchone()[0])) == 0:
+        months = None
+
+    if months is None:
+        cursor.execute("DELETE FROM sales_summary")
+        cursor.execute("DELETE FROM member_sales_summary")
+        cursor.execute(SALES_INSERT_SQL.format(condition=""))
+        cursor.execute(MEMBER_INSERT_SQL.format(condition=""))
+        return None
+
+    condition = "AND b.date >= ? AND b.date < ?"
+    for month in sorted(months):
+        cursor.execute("DELETE FROM sales_summary WHERE sale_month = ?", (month,))
+        cursor.execute("DELETE FROM member_sales_summary WHERE sale_month = ?", (month,))
+        cursor.execute(SALES_INSERT_SQL.format(condition=condition), month_range(month))
+        cursor.execute(MEMBER_INSERT_SQL.format(condition=condition), month_range(month))
+    return len(months)
+
+
+def _frame(cursor, columns):
+    # 조회 결과를 DataFrame 으로 변환 (JDBC 값은 파이썬 기본 타입으로 바꾼다)
+    rows = [[None if value is None else str(value) for value in row] for row in cursor.fetchall()]
+    df = pd.DataFrame(rows, columns=columns)
+    numeric = [column for column in columns if column not in ("month", "year", "method")]
+    df[numeric] = df[numeric].apply(pd.to_numeric)
+    return df
+
+
+def _filters(start=None, end=None, category_no=None, product_no=None, method=None):
+    # 조회 조건 -> (WHERE 절, 인자) (start/end 는 'YYYY-MM', 둘 다 포함)
+    conditions, params = [], []
+    for sql, value in (("sale_month >= ?", start), ("sale_month <= ?", end), ("category_no = ?", category_no),
+                       ("product_no = ?", product_no), ("method = ?", method)):
+        if value is not None:
+            conditions.append(sql)
+            params.append(value)
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+
+def query_sales(cursor, by=("month", "category_no"), start=None, end=None, category_no=None, product_no=None,
+                method=None):
+    # 요약 테이블을 by 열로 묶은 판매 수량, 매출, 주문 수, 각인 서비스 주문 수
+    # 예) 카테고리별 월 매출: query_sales(cursor, ("month", "category_no"))
+    #     연도별 결제 방식: query_sales(cursor, ("year", "method"))
+    unknown = set(by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"묶을 수 없는 열: {', '.join(sorted(unknown))}")
+    keys = [DIMENSIONS[column] for column in by]
+    where, params = _filters(start, end, category_no, product_no, method)
+    select = ", ".join(keys + [f"SUM({measure})" for measure in MEASURES])
+    group = f"GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}" if keys else ""
+    cursor.execute(f"SELECT {select} FROM sales_summary {where} {group}", params)
+    return _frame(cursor, list(by) + MEASURES)
+
+
+def top_members(cursor, year=None, limit=10, order_by="revenue"):
+    # 기간 (year 가 없으면 전체) 동안 매출 (또는 quantity/orders) 상위 회원
+    if order_by not in ("quantity", "revenue", "orders"):
+        raise ValueError(f"정렬할 수 없는 열: {order_by}")
+    where, params = "", []
+    if year:
+        where, params = "WHERE sale_month >= ? AND sale_month <= ?", [f"{year}-01", f"{year}-12"]
+    cursor.execute(f"""
+        SELECT member_no, SUM(quantity), SUM(revenue), SUM(orders)
+        FROM member_sales_summary {where}
+        GROUP BY member_no ORDER BY SUM({order_by}) DESC, member_no LIMIT ?
+    """, params + [limit])
+    return _frame(cursor, ["member_no", "quantity", "revenue", "orders"])
+
+
+def seal_uptake(cursor, by=("year",), **filters):
+    # 각인 서비스 이용률 (각인 주문 수 / 전체 주문 수)
+    df = query_sales(cursor, by, **filters)
+    return df.assign(seal_rate=df["sealed_orders"] / df["orders"])
@@ -0,0 +1,153 @@
+from column_spec import PRODUCT_SPEC, apply_spec
+from startup import lazy_import
+
+# 버전 5 마이그레이션에서 상품 목록 CSV 를 읽을 때만 불러온다
+pd = lazy_import("pandas")
+
+# 스키마 버전 관리
+# 1: 날짜/불리언을 문자열(VARCHAR)로 저장하던 초기 스키마
+# 2: 날짜는 DATE, 'True'/'False' 값은 BOOLEAN 으로 저장
+# 3: buy_table 에 구매_ID 를 정규화한 자연 키 purchase_key (UNIQUE) 추가
+# 4: image_table.origin_path 를 UNIQUE 로 (이미지 적재가 MERGE ... KEY (origin_path) 로 갱신한다)
+# 5: product_table 에 CSV 의 상품 코드 code (UNIQUE) 추가 (구매 이력/이미지가 상품을 찾는 자연 키)
+#    기존 상품은 product_no 순서대로 상품 목록 CSV 의 코드를 채운다
+SCHEMA_VERSION = 5
+
+VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# 버전 2 에서 타입이 바뀐 열: (테이블, 열, 새 타입)
+TYPED_COLUMNS = [
+    ("member_table", "dob", "DATE"),
+    ("member_table", "joinDate", "DATE"),
+    ("member_table", "delete", "BOOLEAN"),
+    ("category_table", "delete", "BOOLEAN"),
+    ("product_table", "seal_service", "BOOLEAN"),
+    ("product_table", "delete", "BOOLEAN"),
+    ("buy_table", "date", "DATE"),
+    ("buy_table", "seal_service", "BOOLEAN"),
+    ("image_table", "save_date", "DATE"),
+    ("image_table", "update_date", "DATE"),
+    ("image_table", "delete", "BOOLEAN"),
+]
+
+# 회원별 구매 이력, 상품별 판매 집계, 기간 조회용 보조 인덱스 (대량 적재가 끝난 뒤 만든다)
+BUY_INDEXES = [
+    ("buy_member_date_idx", "member_no, date"),
+    ("buy_product_date_idx", "product_no, date"),
+    ("buy_date_idx", "date"),
+]
+
+
+def current_version(cursor):
+    # DB 의 스키마 버전 (테이블이 하나도 없으면 0, 버전 기록 없이 테이블만 있으면 1)
+    cursor.execute(VERSION_SQL)
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    version = cursor.fetchone()[0]
+    if version is not None:
+        return int(str(version))
+    cursor.execute("SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES "
+                   "WHERE TABLE_SCHEMA = 'PUBLIC' AND TABLE_NAME = 'MEMBER_TABLE'")
+    return 1 if int(str(cursor.fetchone()[0])) else 0
+
+
+def drop_check_constraints(cursor, table, column):
+    # 열에 걸린 CHECK 제약 조건 삭제 (이름은 H2 가 자동으로 붙이므로 INFORMATION_SCHEMA 에서 찾는다)
+    cursor.execute("""
+        SELECT u.CONSTRAINT_NAME
+        FROM INFORMATION_SCHEMA.CONSTRAINT_COLUMN_USAGE u
+        JOIN INFORMATION_SCHEMA.TABLE_CONSTRAINTS t
+          ON t.CONSTRAINT_SCHEMA = u.CONSTRAINT_SCHEMA AND t.CONSTRAINT_NAME = u.CONSTRAINT_NAME
+        WHERE t.CONSTRAINT_TYPE = 'CHECK' AND u.TABLE_NAME = ? AND u.COLUMN_NAME = ?
+    """, (table.upper(), column.upper()))
+    for (name,) in cursor.fetchall():
+        cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+
+
+def migrate_to_2(cursor):
+    # 문자열 날짜/불리언 열을 DATE/BOOLEAN 으로 변환 (H2 가 기존 값을 그대로 변환한다)
+    for table, column, data_type in TYPED_COLUMNS:
+        drop_check_constraints(cursor, table, column)
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DATA TYPE {data_type}")
+
+
+def migrate_to_3(cursor):
+    # 기존 구매 이력은 key 가 없으므로 (NULL), 그해 파일을 다시 적재할 때 key 가 있는 행으로 바뀐다
+    cursor.execute("ALTER TABLE buy_table ADD COLUMN IF NOT EXISTS purchase_key VARCHAR(30)")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS buy_purchase_key_idx ON buy_table (purchase_key)")
+
+
+def migrate_to_4(cursor):
+    # 같은 origin_path 가 여러 행이면 가장 나중 행만 남기고 UNIQUE 인덱스를 만든다
+    cursor.execute("""
+        DELETE FROM image_table
+        WHERE origin_path IS NOT NULL AND image_no NOT IN (
+            SELECT MAX(image_no) FROM image_table WHERE origin_path IS NOT NULL GROUP BY origin_path
+        )
+    """)
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS image_origin_path_idx ON image_table (origin_path)")
+
+
+def migrate_to_5(cursor, product_file):
+    # 상품 코드 열을 추가하고 코드가 없는 기존 상품은 상품 목록 CSV 에서 채운다
+    # 초기 스키마는 CSV 행 순서대로 product_no 를 1 부터 붙였으므로 (AUTO_INCREMENT) product_no 번째 행의 코드를 쓴다
+    # 그 행의 상품 이름이 다르면 (삽입 오류로 번호가 밀린 경우 등) 추측하지 않고 전체 재적재를 요구한다
+    cursor.execute("ALTER TABLE product_table ADD COLUMN IF NOT EXISTS code VARCHAR(10) UNIQUE")
+    cursor.execute("SELECT product_no, name FROM product_table WHERE code IS NULL ORDER BY product_no")
+    missing = [(int(str(product_no)), str(name).strip()) for product_no, name in cursor.fetchall()]
+    if not missing:
+        return
+    products = apply_spec(pd.read_csv(product_file, encoding="utf-8"), PRODUCT_SPEC)
+    codes, names = products["code"].tolist(), products["name"].tolist()
+    rows = []
+    mismatched = []
+    for product_no, name in missing:
+        if product_no <= len(codes) and codes[product_no - 1] and str(names[product_no - 1]).strip() == name:
+            rows.append((codes[product_no - 1], product_no))
+        else:
+            mismatched.append(product_no)
+    if mismatched:
+        raise RuntimeError(f"상품 목록 CSV 와 맞지 않는 기존 상품 {len(mismatched)}건 (product_no {mismatched[:10]}) 의 "
+                           f"상품 코드를 채울 수 없습니다. --full 옵션으로 전체 재적재가 필요합니다.")
+    cursor.executemany("UPDATE product_table SET code = ? WHERE product_no = ?", rows)
+    print(f"기존 상품 {len(rows)}건의 상품 코드를 상품 목록 CSV 에서 채웠습니다")
+
+
+MIGRATIONS = {
+    2: migrate_to_2,
+    3: migrate_to_3,
+    4: migrate_to_4,
+    5: migrate_to_5,
+}
+
+
+def migrate(cursor, version, product_file):
+    # version 다음 버전부터 SCHEMA_VERSION 까지 순서대로 마이그레이션하고 버전을 기록
+    # (버전 5 는 기존 상품의 코드를 product_file (상품 목록 CSV) 에서 채운다)
+    # (version 이 0 이면 방금 최신 DDL 로 만든 DB 이므로 버전만 기록)
+    if version == 0:
+        cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (SCHEMA_VERSION,))
+        return
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        print(f"스키마 마이그레이션 중: 버전 {target - 1} -> {target}")
+        if target == 5:
+            migrate_to_5(cursor, product_file)
+        else:
+            MIGRATIONS[target](cursor)
+        cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (target,))
+
+
+def create_indexes(cursor):
+    # buy_table 보조 인덱스 생성 (이미 있으면 건너뜀)
+    for name, columns in BUY_INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON buy_table ({columns})")
+
+
+def drop_indexes(cursor):
+    # 대량 적재 전에 보조 인덱스를 지워 행마다 인덱스를 갱신하지 않도록 한다
+    for name, _ in BUY_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,206 @@
+import re
+import sys
+import time
+import threading
+import unicodedata
+from collections import defaultdict
+
+from columnar import read_table
+from db import transaction
+
+# 상품/회원 검색용 문자 n-gram 역색인 (프로세스 안 메모리)
+# LIKE '%...%' 는 매번 전체 테이블을 읽으므로, 적재할 때 이름/주소 등의 글자 1-gram/2-gram -> 행 번호 집합을 만들어 두고
+#     search("product", "색연필 세트", 10) -> [{"product_no": 1, "code": "A1", "name": "색연필 세트", ...}, ...]
+# - 한글은 띄어쓰기가 일정하지 않고 단어 중간부터 찾는 경우가 많아 (만년필 -> 고급 만년필) 형태소 대신 글자 n-gram 을 쓴다
+#   (H2 FT_CREATE_INDEX 는 공백 기준 단어 색인이라 단어 중간을 찾지 못한다)
+# - 검색어를 공백으로 나눈 각 단어의 n-gram 행 집합을 작은 것부터 교집합하고, 남은 후보만 실제 문자열 포함 여부를 확인한다
+# - 필드가 검색어로 시작하는 행 (접두어 일치) 을 먼저, 그다음 짧은 이름 순으로 돌려준다
+# - 색인은 search 를 처음 부를 때 테이블 전체로 만든다 (검색하지 않는 명령행 적재는 색인을 만들지 않는다)
+# - 적재 함수가 바꾼 행의 자연 키 (상품 코드, 회원 아이디) 를 mark_changed 로 알려 주면
+#   refresh_indexes 가 이미 만든 색인에 그 행만 다시 읽어 반영한다
+# delete 가 TRUE 인 행은 색인하지 않는다
+
+# 검색 대상 -> 테이블, 행 번호 열, 자연 키 열, 검색하는 열, 결과에 담는 열
+ENTITIES = {
+    "product": {"table": "product_table", "id": "product_no", "key": "code",
+                "fields": ["name", "company", "code"], "columns": ["product_no", "code", "name", "company"]},
+    "member": {"table": "member_table", "id": "member_no", "key": "id",
+               "fields": ["name", "address", "id"], "columns": ["member_no", "id", "name", "address"]},
+}
+SEARCH_LIMIT = 10
+# 바뀐 행을 다시 읽을 때 IN (...) 하나에 넣는 키 수
+REFRESH_CHUNK = 500
+
+# 검색 대상 -> {"postings": {gram: {행 번호}}, "docs": {행 번호: (compact 한 필드, ...)}, "rows": {행 번호: 결과 dict},
+#              "keys": {자연 키: 행 번호}}
+indexes = {}
+# 검색 대상 -> 다음 refresh_indexes 때 다시 읽을 자연 키
+changed = defaultdict(set)
+# 적재 스레드가 색인을 고치는 동안 다른 스레드의 검색이 반쯤 고친 색인을 보지 않도록
+_lock = threading.Lock()
+
+
+def normalize(text):
+    # 완성형 (NFC) 으로 맞추고 대소문자와 연속 공백을 통일
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", str(text)).casefold()).strip()
+
+
+def compact(text):
+    # 색인/비교용 필드 (띄어쓰기를 빼서 "색연필세트" 로도 "색연필 세트" 를 찾는다)
+    return normalize(text).replace(" ", "")
+
+
+def grams(term):
+    # 단어의 글자 1-gram 과 2-gram (한두 글자 검색어도 색인으로 찾는다)
+    return set(term) | {term[i:i + 2] for i in range(len(term) - 1)}
+
+
+def _document_grams(fields):
+    return set().union(*(grams(field) for field in fields))
+
+
+def _new_index():
+    return {"postings": {}, "docs": {}, "rows": {}, "keys": {}}
+
+
+def _remove(index, row_id):
+    fields = index["docs"].pop(row_id, None)
+    if fields is None:
+        return
+    index["keys"].pop(index["rows"].pop(row_id)["key"], None)
+    for gram in _document_grams(fields):
+        postings = index["postings"].get(gram)
+        if postings is not None:
+            postings.discard(row_id)
+            if not postings:
+                del index["postings"][gram]
+
+
+def _add(index, row_id, key, fields, row):
+    index["docs"][row_id] = fields
+    index["rows"][row_id] = {"key": key, "row": row}
+    index["keys"][key] = row_id
+    for gram in _document_grams(fields):
+        index["postings"].setdefault(gram, set()).add(row_id)
+
+
+def _read_rows(cursor, entity, keys=None):
+    # 검색 대상 행을 [(행 번호, 자연 키, compact 한 필드, 결과 dict), ...] 로 읽는다 (keys 가 있으면 그 자연 키의 행만)
+    spec = ENTITIES[entity]
+    columns = list(dict.fromkeys(spec["columns"] + spec["fields"] + [spec["key"]]))
+    where = "(delete IS NULL OR delete = FALSE)"
+    if keys is not None:
+        where += f" AND {spec['key']} IN ({', '.join('?' for _ in keys)})"
+    # 키/이름이 숫자처럼 보여도 문자열로 받도록 JDBC 로 읽는다 (CSV 방식은 pandas 가 타입을 추정한다)
+    df = read_table(cursor, spec["table"], columns, where, list(keys) if keys is not None else None,
+                    method="jdbc")
+    df = df.set_axis(columns, axis=1)
+    rows = []
+    for record in df.astype(object).where(df.notna(), None).to_dict("records"):
+        fields = tuple(compact(record[field]) if record[field] is not None else "" for field in spec["fields"])
+        rows.append((int(record[spec["id"]]), str(record[spec["key"]]), fields,
+                     {column: record[column] for column in spec["columns"]}))
+    return rows
+
+
+def build_index(cursor, entity):
+    # 테이블 전체로 색인을 새로 만들고 색인한 행 수를 반환
+    index = _new_index()
+    for row_id, key, fields, row in _read_rows(cursor, entity):
+        _add(index, row_id, key, fields, row)
+    # changed 는 비우지 않는다 (적재 중에 다른 스레드에서 만들면 아직 커밋되지 않은 변경이 빠져 있을 수 있다)
+    with _lock:
+        indexes[entity] = index
+    return len(index["docs"])
+
+
+def update_index(cursor, entity, keys):
+    # 자연 키가 keys 인 행만 다시 읽어 색인을 고치고 고친 행 수를 반환
+    # (삭제되었거나 delete 로 표시된 행은 색인에서 빠진다)
+    keys = sorted(str(key) for key in keys)
+    rows = []
+    for start in range(0, len(keys), REFRESH_CHUNK):
+        rows += _read_rows(cursor, entity, keys[start:start + REFRESH_CHUNK])
+    with _lock:
+        index = indexes[entity]
+        for key in keys:
+            if key in index["keys"]:
+                _remove(index, index["keys"][key])
+        for row_id, key, fields, row in rows:
+            _remove(index, row_id)
+            _add(index, row_id, key, fields, row)
+    return len(rows)
+
+
+def mark_changed(entity, keys):
+    # 적재 함수가 삽입/갱신한 행의 자연 키를 알려 준다 (다음 refresh_indexes 에서 반영)
+    with _lock:
+        changed[entity].update(str(key) for key in keys)
+
+
+def clear_indexes():
+    # DB 를 통째로 바꿨을 때 (--full, 스냅샷 복원) 다음 search 에서 처음부터 다시 만들도록 비운다
+    with _lock:
+        indexes.clear()
+        changed.clear()
+
+
+def refresh_indexes(cursor):
+    # 이미 만든 색인에만 바뀐 행을 반영한다
+    # (아직 만들지 않은 색인의 변경은 버린다, 나중에 만들 때 DB 에서 그대로 읽는다)
+    for entity in ENTITIES:
+        with _lock:
+            keys = set(changed[entity])
+            changed[entity].clear()
+        if keys and entity in indexes:
+            print(f"검색 색인 갱신 완료: {entity} {update_index(cursor, entity, keys)}건")
+
+
+def search(entity, text, limit=SEARCH_LIMIT):
+    # entity ("product" / "member") 에서 text 의 모든 단어를 포함하는 행을 최대 limit 개 반환
+    # 색인이 아직 없으면 (적재 없이 검색만 하는 프로세스) DB 에서 한 번 만든다
+    if entity not in ENTITIES:
+        raise ValueError(f"알 수 없는 검색 대상: {entity} (가능한 값: {', '.join(ENTITIES)})")
+    if entity not in indexes:
+        with transaction() as cursor:
+            build_index(cursor, entity)
+    terms = normalize(text).split()
+    if not terms:
+        return []
+    with _lock:
+        index = indexes[entity]
+        postings = [index["postings"].get(gram, ()) for term in terms for gram in grams(term)]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        # n-gram 이 모두 있어도 순서가 다를 수 있으므로 실제로 포함하는지 확인
+        matches = []
+        for row_id in candidates:
+            fields = index["docs"][row_id]
+            if all(any(term in field for field in fields) for term in terms):
+                prefix = any(field.startswith(terms[0]) for field in fields)
+                matches.append((not prefix, len(fields[0]) if fields else 0, row_id))
+        matches.sort()
+        return [dict(index["rows"][row_id]["row"]) for _, _, row_id in matches[:limit]]
+
+
+if __name__ == "__main__":
+    # python search_index.py product 색연필 세트
+    import main
+    from db import configure, resolve_url, shutdown
+
+    configure(main.h2_jar_path, resolve_url(main.db_url), main.username, main.password)
+    try:
+        entity, query = sys.argv[1], " ".join(sys.argv[2:])
+        search(entity, query)
+        start = time.perf_counter()
+        results = search(entity, query)
+        elapsed = time.perf_counter() - start
+        for result in results:
+            print(result)
+        print(f"{len(results)}건, {elapsed * 1000:.3f}ms")
+    finally:
+        shutdown()
@@ -0,0 +1,99 @@
+import os
+import time
+import hashlib
+
+from db import server_is_local
+from load_manifest import file_hash, pending_files
+from schema import SCHEMA_VERSION
+
+# 적재가 끝난 DB 전체를 압축 스크립트 (SCRIPT TO ... COMPRESSION ZIP) 로 저장하고 RUNSCRIPT 로 복원
+# - 스냅샷 파일 이름에 입력 CSV 전체의 해시가 들어가므로, 입력이 그대로인 동안은 다시 만들지 않고
+#   입력이 하나라도 바뀌면 그 입력에 맞는 스냅샷이 없으므로 복원하지 않고 평소처럼 적재한다
+# - 스냅샷에는 load_manifest 도 들어 있어, 복원한 뒤의 증분 적재는 할 일이 없다
+# - tcp/file/mem 어느 접속 대상에도 복원할 수 있다 (테스트용 mem DB 를 몇 초 만에 준비)
+# SCRIPT/RUNSCRIPT 파일은 H2 서버 기준 경로이므로 서버가 같은 컴퓨터에 있어야 한다
+SNAPSHOT_DIR_ENV = "SNAPSHOT_DIR"
+SNAPSHOT_PREFIX = "h2-snapshot-"
+SNAPSHOT_SUFFIX = ".zip"
+# 입력이 바뀌어 쓰지 않게 된 예전 스냅샷은 최근 것 몇 개만 남긴다
+SNAPSHOT_KEEP = 3
+
+
+def snapshot_dir():
+    return os.environ.get(SNAPSHOT_DIR_ENV, os.path.abspath("snapshots"))
+
+
+def inputs_hash(file_paths):
+    # 입력 CSV (이름과 내용) 와 스키마 버전으로 만든 스냅샷 키
+    digest = hashlib.sha256(f"schema={SCHEMA_VERSION}\n".encode())
+    for file_path in sorted(file_paths, key=os.path.basename):
+        if os.path.exists(file_path):
+            digest.update(f"{os.path.basename(file_path)}={file_hash(file_path)}\n".encode())
+    return digest.hexdigest()
+
+
+def snapshot_path(file_paths):
+    return os.path.join(snapshot_dir(), f"{SNAPSHOT_PREFIX}{inputs_hash(file_paths)[:16]}{SNAPSHOT_SUFFIX}")
+
+
+def _quoted(path):
+    return os.path.abspath(path).replace("'", "''")
+
+
+def save_snapshot(cursor, file_paths):
+    # 현재 DB 를 입력 해시 이름의 스냅샷으로 저장하고 경로를 반환 (저장하지 않았으면 None)
+    # 커밋한 뒤에 호출한다 (load_manifest 가 입력 파일과 일치해야 저장한다)
+    if not server_is_local():
+        print("H2 서버가 다른 컴퓨터에 있어 스냅샷을 저장할 수 없습니다")
+        return None
+    path = snapshot_path(file_paths)
+    if os.path.exists(path):
+        print(f"입력 CSV 가 바뀌지 않아 기존 스냅샷을 그대로 사용합니다: {os.path.basename(path)}")
+        return path
+    pending = pending_files(cursor, file_paths)
+    if pending:
+        # 적재에 실패했거나 적재 후 바뀐 파일이 있으면 스냅샷이 입력과 맞지 않는다
+        print(f"적재되지 않은 파일이 있어 스냅샷을 저장하지 않습니다: "
+              f"{', '.join(os.path.basename(file_path) for file_path in pending)}")
+        return None
+
+    os.makedirs(snapshot_dir(), exist_ok=True)
+    start = time.perf_counter()
+    # 다른 프로세스가 읽는 도중의 파일을 보지 않도록 임시 이름으로 쓰고 바꾼다
+    partial = path + ".partial"
+    cursor.execute(f"SCRIPT TO '{_quoted(partial)}' COMPRESSION ZIP")
+    os.replace(partial, path)
+    prune_snapshots(path)
+    print(f"스냅샷 저장 완료: {os.path.basename(path)} "
+          f"({os.path.getsize(path) / 2 ** 20:.1f}MB, {time.perf_counter() - start:.2f}초)")
+    return path
+
+
+def restore_snapshot(cursor, file_paths):
+    # 지금 입력과 같은 입력으로 만든 스냅샷이 있으면 DB 를 지우고 복원한 뒤 True 반환
+    if not server_is_local():
+        print("H2 서버가 다른 컴퓨터에 있어 스냅샷을 복원할 수 없습니다")
+        return False
+    path = snapshot_path(file_paths)
+    if not os.path.exists(path):
+        print("입력 CSV 에 맞는 스냅샷이 없어 CSV 에서 적재합니다")
+        return False
+    start = time.perf_counter()
+    cursor.execute("DROP ALL OBJECTS")
+    cursor.execute(f"RUNSCRIPT FROM '{_quoted(path)}' COMPRESSION ZIP")
+    os.utime(path)
+    print(f"스냅샷 복원 완료: {os.path.basename(path)} ({time.perf_counter() - start:.2f}초)")
+    return True
+
+
+def prune_snapshots(keep_path):
+    # 최근에 쓴 SNAPSHOT_KEEP 개만 남기고 지운다 (keep_path 는 항상 남긴다)
+    directory = snapshot_dir()
+    paths = [os.path.join(directory, name) for name in os.listdir(directory)
+             if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in [path for path in paths if path != keep_path][SNAPSHOT_KEEP - 1:]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"예전 스냅샷 삭제 중 오류 발생: {e}")
@@ -0,0 +1,70 @@
+import sys
+import time
+import types
+import importlib.util
+
+# 실행 파일 시작 시간 측정과 지연 import
+# - pandas/numpy/jpype/pyarrow 는 import 만으로 수백 ms 가 걸리므로 처음 실제로 쓰는 단계에서 불러온다
+#   (바뀐 파일이 없는 증분 실행은 pandas 를 전혀 불러오지 않는다)
+# - 실제 import 시간과 JVM 시작 시간을 기록해 --startup-report 로 출력한다
+# 기준 시각은 이 모듈이 처음 import 된 시점 (main.py 가 가장 먼저 import 한다)
+STARTED = time.perf_counter()
+
+# (단계, 걸린 시간(초), 기준 시각부터 단계가 끝날 때까지 경과 시간(초))
+timings = []
+
+
+def record(stage, seconds):
+    timings.append((stage, seconds, time.perf_counter() - STARTED))
+
+
+def mark(stage):
+    # 기준 시각부터 지금까지의 경과 시간만 기록
+    record(stage, None)
+
+
+def lazy_import(name):
+    # 처음 속성에 접근할 때 실제로 import 되는 모듈을 반환 (설치되어 있지 않으면 None)
+    # PyInstaller 는 이름 문자열로 불러오는 모듈을 찾지 못하므로 spec 의 hiddenimports 에 넣어야 한다
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        # 상위 패키지가 없을 때 (Pillow 없이 "PIL.Image")
+        spec = None
+    if spec is None:
+        return None
+
+    original = spec.loader
+
+    def timed_exec_module(module):
+        # 실제 로더로 되돌린 뒤 실행 (PyInstaller 는 모든 모듈이 로더 하나를 공유하므로 로더 자체는 고치지 않는다)
+        module.__spec__.loader = module.__loader__ = original
+        start = time.perf_counter()
+        original.exec_module(module)
+        record(f"import {name}", time.perf_counter() - start)
+
+    timed = types.SimpleNamespace(create_module=original.create_module, exec_module=timed_exec_module)
+    loader = importlib.util.LazyLoader(timed)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_loaded(module):
+    # 지연 import 한 모듈이 실제로 불러와졌는지 확인 (속성에 접근하면 그 자리에서 불러오므로 타입만 본다)
+    return module is not None and type(module).__name__ != "_LazyModule"
+
+
+def print_report():
+    # 기록된 단계를 시간 순서대로 출력
+    # (import 시간에는 그 모듈이 불러온 하위 모듈 시간이 포함된다)
+    print("시작 시간 보고 (main 모듈 실행 시작 기준):")
+    for stage, seconds, elapsed in timings:
+        # 한글은 콘솔에서 두 칸을 차지하므로 그만큼 덜 채운다
+        padding = " " * max(24 - len(stage) - sum(ch >= "\u1100" for ch in stage), 0)
+        took = f"{seconds:8.3f}초" if seconds is not None else " " * 10
+        print(f"  {stage}{padding} {took}   (경과 {elapsed:.3f}초)")
@@ -0,0 +1,171 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+# 벤치마크용 가상 CSV 생성기
+# 실제 CSV 와 같은 파일 이름/헤더/형식으로 원하는 규모의 상품목록, 연도별 회원목록, 연도별 구매이력을 만든다
+# 운영 데이터에서 보이는 형식 차이도 그대로 재현한다:
+# - 금액은 " 1,200,000 " 처럼 앞뒤 공백과 천 단위 쉼표가 들어간 따옴표 문자열
+# - 헤더 공백 (" in_price "), 연도별로 다른 헤더 ("메일_주소" / "메일 주소")
+# - 구매_ID 형식 혼재 ("2019-01-010069-1" / "2023-01-01-0351-1"), 0 으로 채운 구매자_ID ("0069")
+# - 회원목록은 해마다 그때까지 가입한 전체 회원을 담은 누적 스냅샷
+# 같은 seed 로 만들면 항상 같은 파일이 나온다
+
+CATEGORIES = [("A", "art"), ("C", "cases"), ("S", "stationery"), ("W", "writing")]
+PRODUCT_NAMES = ["색연필 세트", "드로잉 펜 세트", "가죽 필통", "양장노트", "다이어리", "잠금장치 노트",
+                 "실링 왁스 세트", "리필 종이", "만년필", "탄생석 펜", "연필 ", "지우개 세트", "깃펜 세트"]
+COMPANIES = ["펜토리", "리프펜", "레더로우", "노트리움", "잉크테일"]
+PRICES = [500, 1500, 4000, 5000, 5500, 10000, 12000, 17000, 22000, 25000, 35000, 45000, 60000, 80000]
+
+SURNAMES = [("김", "kim"), ("이", "lee"), ("박", "park"), ("최", "choi"), ("정", "jung"), ("장", "jang"),
+            ("조", "choh"), ("윤", "yoon"), ("한", "han"), ("임", "lim")]
+GIVEN_NAMES = ["소희", "현정", "민정", "지훈", "서연", "도윤", "하은", "준호", "수빈", "예준", "지우", "민준"]
+STREETS = ["첨단로", "해운대로", "삼산로", "중앙로", "테헤란로", "세종대로"]
+PAYMENT_METHODS = ["신용카드", "계좌이체", "카카오페이"]
+PAYMENT_WEIGHTS = [0.5, 0.35, 0.15]
+QUANTITIES = [1, 2, 3, 5, 10, 20, 50, 80, 100, 300]
+
+PRODUCT_HEADER = ["product_no", "category_no", "name", "company", " in_price ", " out_price ",
+                  "sell_count", "quantity", "visit", "seal_service"]
+MEMBER_HEADER = ["PID", "아이디", "비밀번호", "성함", "주민번호", "주소", "메일_주소", "회원_가입일", "전화번호"]
+PURCHASE_HEADER = ["구매_ID", "구매_날짜", "구매자_ID", "상품_ID", "구매_수량", "각인_서비스", "결제_방식",
+                   "총_결제_금액"]
+
+
+def formatted(values, fmt):
+    # 정수 배열을 fmt 형식 문자열로 변환 (서로 다른 값만 한 번씩 포맷해 큰 배열도 빠르게 만든다)
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([fmt.format(value) for value in unique.tolist()], dtype=object)[inverse]
+
+
+def quoted_amount(values):
+    # 금액 -> " 1,200,000 " 형식 문자열
+    return formatted(values, " {:,} ")
+
+
+def random_dates(rng, year, size, sort=False):
+    # year 안의 임의 날짜 (numpy datetime64[D])
+    start = np.datetime64(f"{year}-01-01")
+    days = (np.datetime64(f"{year + 1}-01-01") - start).astype(int)
+    offsets = rng.integers(0, days, size)
+    if sort:
+        offsets.sort()
+    return start + offsets
+
+
+def make_products(rng, count):
+    # 카테고리를 돌아가며 A1, C1, S1, W1, A2 ... 순서로 상품 코드를 만든다
+    positions = np.arange(count)
+    letters, categories = zip(*(CATEGORIES[i % len(CATEGORIES)] for i in positions))
+    in_price = rng.choice(PRICES, count)
+    out_price = in_price * rng.choice([2, 3], count) + 500
+    return pd.DataFrame({
+        "product_no": [f"{letter}{i // len(CATEGORIES) + 1}" for letter, i in zip(letters, positions)],
+        "category_no": categories,
+        "name": rng.choice(PRODUCT_NAMES, count),
+        "company": rng.choice(COMPANIES, count),
+        " in_price ": quoted_amount(in_price),
+        " out_price ": quoted_amount(out_price),
+        "sell_count": "",
+        "quantity": rng.choice([200, 500, 1000, 1500], count),
+        "visit": "",
+        "seal_service": rng.choice(["T", "F"], count),
+    }, columns=PRODUCT_HEADER), out_price
+
+
+def make_members(rng, count, years):
+    # 가입일 순서로 회원을 만든다 (PID 와 member_no 가 같아지도록)
+    pid = np.arange(1, count + 1)
+    surname = rng.integers(0, len(SURNAMES), count)
+    birth = np.datetime64("1960-01-01") + rng.integers(0, 50 * 365, count)
+    birth_text = pd.Series(birth).dt.strftime("%y%m%d").to_numpy(dtype=object)
+    born_2000s = birth >= np.datetime64("2000-01-01")
+    gender = rng.integers(1, 3, count) + np.where(born_2000s, 2, 0)
+    romanized = np.array([name for _, name in SURNAMES], dtype=object)[surname]
+    ids = romanized + pd.Series(pid).astype(str).to_numpy(dtype=object)
+
+    joined = np.sort(np.concatenate([random_dates(rng, year, size) for year, size in
+                                     zip(years, np.diff(np.linspace(0, count, len(years) + 1).astype(int)))]))
+    return pd.DataFrame({
+        "PID": pid,
+        "아이디": ids,
+        "비밀번호": "password" + pd.Series(pid).astype(str).to_numpy(dtype=object),
+        "성함": np.array([name for name, _ in SURNAMES], dtype=object)[surname]
+                + rng.choice(GIVEN_NAMES, count).astype(object),
+        "주민번호": birth_text + "-" + gender.astype(str).astype(object),
+        "주소": "서울특별시 " + rng.choice(STREETS, count).astype(object) + " "
+              + rng.integers(1, 100, count).astype(str).astype(object),
+        "메일_주소": ids + "@example.com",
+        "회원_가입일": pd.Series(joined).dt.strftime("%Y-%m-%d").to_numpy(),
+        "전화번호": "010-" + pd.Series(1111 + pid // 10000).astype(str).to_numpy(dtype=object) + "-"
+                  + formatted(pid % 10000, "{:04d}"),
+    }, columns=MEMBER_HEADER), joined
+
+
+def make_purchases(rng, year, count, products, out_price, joined):
+    # 그해 말까지 가입한 회원이 그해 날짜에 산 구매 이력
+    members = max(int(np.searchsorted(joined, np.datetime64(f"{year + 1}-01-01"))), 1)
+    dates = random_dates(rng, year, count, sort=True)
+    date_text = pd.Series(dates).dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+    buyer_text = formatted(rng.integers(1, members + 1, count), "{:04d}")
+    product = rng.integers(0, len(products), count)
+    quantity = rng.choice(QUANTITIES, count)
+
+    # 같은 날 같은 회원의 n 번째 구매, 날짜와 회원 번호 사이 '-' 는 행마다 있거나 없다
+    sequence = pd.DataFrame({"d": date_text, "b": buyer_text}).groupby(["d", "b"]).cumcount() + 1
+    separator = rng.choice(np.array(["-", ""], dtype=object), count)
+    purchase_id = date_text + separator + buyer_text + "-" + sequence.astype(str).to_numpy(dtype=object)
+    return pd.DataFrame({
+        "구매_ID": purchase_id,
+        "구매_날짜": date_text,
+        "구매자_ID": buyer_text,
+        "상품_ID": products["product_no"].to_numpy()[product],
+        "구매_수량": quantity,
+        "각인_서비스": rng.choice(["T", "F"], count, p=[0.2, 0.8]),
+        "결제_방식": rng.choice(PAYMENT_METHODS, count, p=PAYMENT_WEIGHTS),
+        "총_결제_금액": quoted_amount(quantity * out_price[product]),
+    }, columns=PURCHASE_HEADER)
+
+
+def generate(out_dir, members=1000, purchases=1200, products=18, first_year=2019, years=5, seed=0):
+    # out_dir 에 실제 CSV 와 같은 이름의 파일을 만들고 파일 경로 목록을 반환
+    # members: 마지막 해까지의 전체 회원 수, purchases: 해마다 구매 이력 행 수
+    rng = np.random.default_rng(seed)
+    year_range = list(range(first_year, first_year + years))
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {"products": os.path.join(out_dir, "상품목록.csv"), "members": [], "purchases": []}
+
+    product_df, out_price = make_products(rng, products)
+    product_df.to_csv(paths["products"], index=False, encoding="utf-8")
+
+    member_df, joined = make_members(rng, members, year_range)
+    for year in year_range:
+        path = os.path.join(out_dir, f"회원목록_{year}년.csv")
+        snapshot = member_df[joined < np.datetime64(f"{year + 1}-01-01")]
+        # 마지막 해 파일은 운영 데이터처럼 헤더가 "메일 주소" 로 바뀌어 있다
+        if year == year_range[-1]:
+            snapshot = snapshot.rename(columns={"메일_주소": "메일 주소"})
+        snapshot.to_csv(path, index=False, encoding="utf-8")
+        paths["members"].append(path)
+
+    for year in year_range:
+        path = os.path.join(out_dir, f"구매이력_{year}년.csv")
+        make_purchases(rng, year, purchases, product_df, out_price, joined).to_csv(path, index=False,
+                                                                                   encoding="utf-8")
+        paths["purchases"].append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 가상 상품/회원/구매 CSV 생성")
+    parser.add_argument("out_dir", help="CSV 를 저장할 폴더")
+    parser.add_argument("--members", type=int, default=1000, help="전체 회원 수 (기본값 1000)")
+    parser.add_argument("--purchases", type=int, default=1200, help="연도별 구매 이력 행 수 (기본값 1200)")
+    parser.add_argument("--products", type=int, default=18, help="상품 수 (기본값 18)")
+    parser.add_argument("--first-year", type=int, default=2019, help="첫 연도 (기본값 2019)")
+    parser.add_argument("--years", type=int, default=5, help="연도 수 (기본값 5)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 seed (같은 값이면 같은 파일)")
+    args = parser.parse_args()
+    generate(args.out_dir, args.members, args.purchases, args.products, args.first_year, args.years, args.seed)
+    print(f"가상 데이터 생성 완료: {args.out_dir}")
@@ -3,6 +3,8 @@ import jpype
 import jaydebeapi
 import pandas as pd
 
+from column_spec import MEMBER_SPEC, PRODUCT_SPEC, PURCHASE_SPEC, apply_spec
+
 # 경로 설정
 base_dir = os.path.dirname(os.path.abspath(__file__))
 h2_jar_path = os.path.join(base_dir, "jar/h2-2.3.232.jar")
@@ -40,6 +42,7 @@ def initialize_database(cursor):
 
     CREATE TABLE product_table (
         product_no INTEGER PRIMARY KEY AUTO_INCREMENT,
+        code VARCHAR(10) UNIQUE,
         category_no INTEGER,
         name VARCHAR(100) NOT NULL,
         company VARCHAR(100),
@@ -135,40 +138,14 @@ def load_products(cursor):
             conn.close()
             exit()
 
-        # 열 이름 정리 (공백 제거 및 소문자 변환)
-        df.columns = df.columns.str.strip().str.lower()
-
-        # 카테고리 매핑 테이블 (문자열 -> 숫자 변환)
-        category_mapping = {
-            "art": 1,
-            "cases": 2,
-            "stationery": 3,
-            "writing": 4
-        }
-
-        # 카테고리 문자열을 숫자로 변환 (없을 경우 기본값 -1로 설정)
-        df['category_no'] = df['category_no'].map(category_mapping).fillna(-1).astype(int)
-
-        # 빈 값 처리 및 데이터 정리
-        df['in_price'] = df['in_price'].astype(str).str.replace(',', '').astype(int)
-        df['out_price'] = df['out_price'].astype(str).str.replace(',', '').astype(int)
-        df['sell_count'] = df['sell_count'].fillna(0).astype(int)  # 판매량 기본값 0
-        df['quantity'] = df['quantity'].fillna(0).astype(int)  # 재고 기본값 0
-        df['visit'] = df['visit'].fillna(0).astype(int)  # 조회수 기본값 0
-        df['seal_service'] = df['seal_service'].replace({'T': 'True', 'F': 'False'}).fillna('False')  # 각인 여부 기본값 False
-
-        # `delete` 컬럼 추가 (기본값 'False' 설정)
-        if 'delete' not in df.columns:
-            df['delete'] = 'False'
-
-        # `product_no` 열이 존재하면 제거
-        if 'product_no' in df.columns:
-            df = df.drop(columns=['product_no'])
+        # 열 정의(PRODUCT_SPEC)대로 정리 (이 스크립트의 테이블은 'True'/'False' 문자열 열)
+        # CSV 의 `product_no` 는 상품 코드이므로 code 열로 보관 (구매 이력이 상품을 찾는 키)
+        df = apply_spec(df, PRODUCT_SPEC).astype({'seal_service': str}).assign(delete='False')
 
         # 데이터 삽입 SQL 템플릿
         insert_sql = """
-        INSERT INTO product_table (category_no, name, company, in_price, out_price, sell_count, quantity, visit, seal_service, delete)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO product_table (code, category_no, name, company, in_price, out_price, sell_count, quantity, visit, seal_service, delete)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
 
         # 데이터프레임에서 각 행 삽입
@@ -176,6 +153,7 @@ def load_products(cursor):
         for _, row in df.iterrows():
             try:
                 cursor.execute(insert_sql, [
+                    row['code'],
                     row['category_no'],
                     row['name'],
                     row['company'],
@@ -224,32 +202,8 @@ def load_members(cursor):
             print(f"{file_path} 로드 성공!")
             df = pd.read_csv(file_path, encoding='utf-8')
 
-            # 필요한 열이 없을 경우 기본 값으로 설정
-            required_columns = ['PID', '아이디', '비밀번호', '성함', '주민번호', '주소', '메일 주소', '회원_가입일', '전화번호']
-            for col in required_columns:
-                if col not in df.columns:
-                    df[col] = None
-
-            # 데이터 정리
-            df = df.rename(columns={
-                '아이디': 'id',
-                '비밀번호': 'password',
-                '성함': 'name',
-                '주민번호': 'dob_gender',
-                '주소': 'address',
-                '메일 주소': 'email',
-                '회원_가입일': 'joinDate',
-                '전화번호': 'phone'
-            })
-
-            # 생년월일과 성별 추출
-            df['dob'] = df['dob_gender'].str[:6].apply(
-                lambda x: f"19{x[:2]}-{x[2:4]}-{x[4:6]}" if len(x) >= 6 else None)
-            df['gender'] = df['dob_gender'].str[-1].apply(
-                lambda x: '남' if x in ['1', '3'] else ('여' if x in ['2', '4'] else None))
-
-            # 불필요한 열 제거
-            df = df[['id', 'password', 'name', 'dob', 'gender', 'address', 'email', 'phone', 'joinDate']]
+            # 열 정의(MEMBER_SPEC)대로 정리 (연도별 헤더 차이, 주민번호 -> 생년월일/성별 포함)
+            df = apply_spec(df, MEMBER_SPEC)
 
             # 데이터 삽입
             for _, row in df.iterrows():
@@ -282,31 +236,25 @@ def load_purchases(cursor):
         os.path.join(csv_folder, '구매이력_2023년.csv'),
     ]
 
+    # 상품 코드 -> product_no (코드의 숫자만 쓰면 A1/C1/S1/W1 이 모두 1 번 상품이 된다)
+    cursor.execute("SELECT code, product_no FROM product_table WHERE code IS NOT NULL")
+    product_index = {str(code): int(str(product_no)) for code, product_no in cursor.fetchall()}
+
     # CSV 파일 처리
     for file_path in csv_files:
         try:
             # CSV 파일 읽기
             df = pd.read_csv(file_path, encoding='utf-8', dtype=str)
 
-            # 모든 열 이름의 공백 제거
-            df.columns = df.columns.str.strip()
-
-            # 열 이름 변경 및 데이터 정리
-            df = df.rename(columns={
-                '구매_ID': 'buy_no',
-                '구매_날짜': 'date',
-                '구매자_ID': 'member_no',
-                '상품_ID': 'product_no',
-                '구매_수량': 'quantity',
-                '각인_서비스': 'seal_service',
-                '결제_방식': 'method',
-                '총_결제_금액': 'total_price'
-            })
-
-            # 데이터 타입 변환
-            df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce').fillna(0).astype(int)
-            df['total_price'] = df['total_price'].str.replace(',', '', regex=True).fillna('0').astype(int)
-            df['product_no'] = df['product_no'].str.extract(r'(\d+)').fillna(0).astype(int)
+            # 열 정의(PURCHASE_SPEC)대로 정리
+            df = apply_spec(df, PURCHASE_SPEC).astype({'seal_service': str})
+            df['product_no'] = df['product_code'].map(product_index)
+
+            # 등록되지 않은 상품 코드의 구매 이력은 제외
+            unknown = df['product_no'].isna()
+            for _, row in df[unknown].iterrows():
+                print(f"등록되지 않은 상품 코드: {row['product_code']} | 데이터: {row.to_dict()}")
+            df = df[~unknown].astype({'product_no': int})
 
             # 데이터 삽입
             for _, row in df.iterrows():
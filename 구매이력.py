@@ -1,6 +1,9 @@
 import os
 import pandas as pd
-from jaydebeapi import connect
+
+from bulk_insert import merge_dataframe
+from column_spec import PURCHASE_SPEC, apply_spec
+from db import configure, default_url, shutdown, transaction
 
 # 경로 설정
 base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,15 +11,20 @@ csv_folder = os.path.join(base_dir, 'csv')
 h2_jar_path = os.path.join(base_dir, "jar/h2-2.3.232.jar")
 
 # H2 데이터베이스 연결 설정
-url = "jdbc:h2:tcp://localhost/~/test"
+url = default_url()  # H2_DB_URL 환경 변수로 변경
 user = "sa"
 password = ""
 
+configure(h2_jar_path, url, user, password)
+
+# 상품 코드 (A1, C2, ...) -> product_no 매핑을 한 번에 읽어 둔다
 try:
-    conn = connect("org.h2.Driver", url, [user, password], h2_jar_path)
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        cursor.execute("SELECT code, product_no FROM product_table WHERE code IS NOT NULL")
+        product_index = {str(code): int(str(product_no)) for code, product_no in cursor.fetchall()}
 except Exception as e:
     print(f"데이터베이스 연결 실패: {e}")
+    shutdown()
     exit()
 
 # CSV 파일 경로 목록 설정
@@ -34,49 +42,32 @@ for file_path in csv_files:
         # CSV 파일 읽기
         df = pd.read_csv(file_path, encoding='utf-8', dtype=str)
 
-        # 모든 열 이름의 공백 제거
-        df.columns = df.columns.str.strip()
+        # 열 정의(PURCHASE_SPEC)대로 정리한 뒤 상품 코드를 product_no 로 변환
+        df = apply_spec(df, PURCHASE_SPEC)
+        df['product_no'] = df['product_code'].map(product_index)
 
-        # 열 이름 변경 및 데이터 정리
-        df = df.rename(columns={
-            '구매_ID': 'buy_no',
-            '구매_날짜': 'date',
-            '구매자_ID': 'member_no',
-            '상품_ID': 'product_no',
-            '구매_수량': 'quantity',
-            '각인_서비스': 'seal_service',
-            '결제_방식': 'method',
-            '총_결제_금액': 'total_price'
-        })
+        # 등록되지 않은 상품 코드는 제외
+        unknown = df['product_no'].isna()
+        for idx in df.index[unknown]:
+            print(f"등록되지 않은 상품 코드: {df.at[idx, 'product_code']} | 데이터: {df.loc[idx].to_dict()}")
+        df = df[~unknown].astype({'product_no': int})
 
-        # 데이터 타입 변환
-        df['quantity'] = pd.to_numeric(df['quantity'], errors='coerce').fillna(0).astype(int)
-        df['total_price'] = df['total_price'].str.replace(',', '', regex=True).fillna('0').astype(int)
-        df['product_no'] = df['product_no'].str.extract(r'(\d+)').fillna(0).astype(int)
+        # 구매_ID 를 해석할 수 없는 행은 제외
+        missing = df['purchase_key'].isna()
+        for idx in df.index[missing]:
+            print(f"구매_ID 형식 오류 | 데이터: {df.loc[idx].to_dict()}")
+        df = df[~missing]
 
-        # 데이터 삽입
-        for _, row in df.iterrows():
-            try:
-                cursor.execute("""
-                    INSERT INTO buy_table (member_no, product_no, date, quantity, seal_service, total_price, method)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['member_no'],
-                    row['product_no'],
-                    row['date'],
-                    row['quantity'],
-                    row['seal_service'],
-                    row['total_price'],
-                    row['method']
-                ))
-            except Exception as e:
-                print(f"데이터 삽입 오류: {e} | 데이터: {row.to_dict()}")
+        # 구매_ID 자연 키 기준 MERGE (같은 파일을 다시 실행해도 중복되지 않는다, 파일마다 풀에서 연결을 빌려 커밋)
+        insert_columns = ['purchase_key', 'member_no', 'product_no', 'date', 'quantity', 'seal_service',
+                          'total_price', 'method']
+        with transaction() as cursor:
+            inserted, errors = merge_dataframe(cursor, "buy_table", insert_columns, "purchase_key", df)
+        for idx, error in errors:
+            print(f"데이터 삽입 오류: {error} | 데이터: {df.loc[idx].to_dict()}")
     except Exception as e:
         print(f"파일 처리 중 오류 발생: {file_path}, 오류 메시지: {e}")
 
-# 커밋 및 연결 종료
-try:
-    conn.commit()
-    print("구매 이력 데이터가 성공적으로 H2 데이터베이스에 등록되었습니다!")
-finally:
-    conn.close()
+# 연결 및 JVM 종료
+print("구매 이력 데이터가 성공적으로 H2 데이터베이스에 등록되었습니다!")
+shutdown()